@@ -24,9 +24,16 @@ Usage:
 
 """
 import argparse
+import glob
+import json
 import os
+import re
+import shutil
+import stat
 import subprocess
 import sys
+import threading
+import time
 
 
 if sys.version_info < (3, 0):
@@ -36,14 +43,13 @@ if sys.version_info < (3, 0):
 EBCLI_INSTALLER_STAMP = '.ebcli_installer_stamp'
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-with open(os.path.join(PROJECT_ROOT, 'VERSION')) as version_file:
-    EBCLI_INSTALLER_VERSION = version_file.read().strip()
 
 
 EXECUTABLE_WRAPPERS = {
     'bat': '\n'.join(
         [
             '@echo off',
+            'setlocal',
             'REM Safe way to consolidate CMD line arguments to pass to `eb`',
             'set args=%1',
             'shift',
@@ -54,23 +60,87 @@ EXECUTABLE_WRAPPERS = {
             'goto start',
             ':done',
             '',
+            'REM pick the version of the EBCLI to invoke: environment variable,',
+            'REM nearest project version file, or the default pointer',
+            'set "version=%{version_variable}%"',
+            'if not "%version%" == "" goto selected',
+            'set "directory=%CD%"',
+            ':search',
+            'if exist "%directory%\\{project_version_file}" (',
+            '    set /p version=<"%directory%\\{project_version_file}"',
+            '    goto selected',
+            ')',
+            'for %%I in ("%directory%\\..") do set "parent=%%~fI"',
+            'if "%parent%" == "%directory%" goto fallback',
+            'set "directory=%parent%"',
+            'goto search',
+            ':fallback',
+            'if exist "{environments_root}\\{default_pointer}" set /p version=<"{environments_root}\\{default_pointer}"',
+            'if exist "{root}\\{default_pointer}" set /p version=<"{root}\\{default_pointer}"',
+            ':selected',
+            'set "bin_location={environments_root}\\{environments_directory}\\%version%\\Scripts"',
+            'if not exist "%bin_location%\\eb.exe" (',
+            '    echo EBCLI version "%version%" is not installed in "{environments_root}".',
+            '    exit /b 1',
+            ')',
+            'if exist "{root}\\{overlay_directory}" set "PYTHONPATH={root}\\{overlay_directory};%PYTHONPATH%"',
+            '',
             'REM activate virtualenv, call eb and deactivate virtualenv',
-            'CALL {bin_location}\\activate.bat',
-            '@start CALL {bin_location}\\eb.exe %args%',
+            'CALL "%bin_location%\\activate.bat"',
+            '@start CALL "%bin_location%\\eb.exe" %args%',
             '@echo off',
             'deactivate'
         ]
     ),
     'ps1': '\n'.join(
         [
-            '{bin_location}\\activate.ps1',
-            '{bin_location}\\eb $args',
+            '$EbcliRoot = "{root}"',
+            '$EnvironmentsRoot = "{environments_root}"',
+            '$Version = $env:{version_variable}',
+            'if (-not $Version) {{',
+            '    $Directory = (Get-Location).Path',
+            '    while ($Directory) {{',
+            '        $ProjectVersionFile = Join-Path $Directory "{project_version_file}"',
+            '        if (Test-Path $ProjectVersionFile -PathType Leaf) {{',
+            '            $Version = Get-Content $ProjectVersionFile -TotalCount 1',
+            '            break',
+            '        }}',
+            '        $Directory = Split-Path $Directory -Parent',
+            '    }}',
+            '}}',
+            'foreach ($Root in @($EbcliRoot, $EnvironmentsRoot)) {{',
+            '    if ((-not $Version) -and (Test-Path "$Root\\{default_pointer}")) {{',
+            '        $Version = Get-Content "$Root\\{default_pointer}" -TotalCount 1',
+            '    }}',
+            '}}',
+            '$Version = "$Version".Trim()',
+            '$BinLocation = "$EnvironmentsRoot\\{environments_directory}\\$Version\\Scripts"',
+            'if (-not (Test-Path "$BinLocation\\eb.exe")) {{',
+            '    Write-Host "EBCLI version `"$Version`" is not installed in `"$EnvironmentsRoot`"." -ForegroundColor Red',
+            '    exit 1',
+            '}}',
+            'if (Test-Path "$EbcliRoot\\{overlay_directory}") {{',
+            '    $env:PYTHONPATH = (@("$EbcliRoot\\{overlay_directory}", $env:PYTHONPATH) | Where-Object {{ $_ }}) -join ";"',
+            '}}',
+            '& "$BinLocation\\activate.ps1"',
+            '& "$BinLocation\\eb" $args',
             'deactivate'
         ]
     ),
-    'py': """#!/usr/bin/env python
+    'py': """#!{interpreter}
+import glob
+import os
 import subprocess
 import sys
+import time
+
+
+EBCLI_ROOT = "{root}"
+ENVIRONMENTS_ROOT = "{environments_root}"
+OVERLAY = os.path.join(EBCLI_ROOT, "{overlay_directory}")
+INDEX_URL = "{index_url}"
+UPDATE_CHECK_CACHE = os.path.join(EBCLI_ROOT, "{update_check_cache}")
+UPDATE_CHECK_TTL = {update_check_ttl}
 
 
 def _exec_cmd(args):
@@ -105,18 +175,460 @@ def _exec_cmd(args):
     return p.returncode
 
 
-activate_this = "{bin_location}/activate_this.py"
+def _check_for_update(installation):
+    \"\"\"
+    Function prints a one-line notice to STDERR when the update check cache
+    records a newer version of the EBCLI than the one installed as
+    `installation`, a versioned virtualenv or zipapp, and refreshes the cache
+    in a detached background process once it is older than its TTL. Only the
+    cache is read here; the package index is never contacted from the
+    foreground process.
+    \"\"\"
+    if os.environ.get("{update_check_opt_out}"):
+        return
+
+    try:
+        checked_at, _, latest_version = _read_first_line(UPDATE_CHECK_CACHE).partition(" ")
+        checked_at = float(checked_at)
+    except (IOError, OSError, ValueError):
+        checked_at, latest_version = 0, ""
+
+    try:
+        ttl = float(os.environ.get("{update_check_ttl_variable}") or UPDATE_CHECK_TTL)
+    except ValueError:
+        ttl = UPDATE_CHECK_TTL
+    if time.time() - checked_at > ttl:
+        _spawn_update_check()
+
+    if not _version_tuple(latest_version):
+        return
+
+    installed_version = _installed_version(installation)
+    if (
+        installed_version
+        and _version_tuple(installed_version)
+        and _version_tuple(latest_version) > _version_tuple(installed_version)
+    ):
+        sys.stderr.write(
+            'Note: EBCLI ' + latest_version + ' is available; you are using ' + installed_version + '.\\n'
+        )
+
+
+def _record_use(installation):
+    \"\"\"
+    Function refreshes the "{last_used_marker}" marker of `installation`,
+    at most hourly, so that the installer's `--gc` can evict the least
+    recently used versions first. The marker of a versioned virtualenv lies
+    within it, and that of a zipapp next to it.
+    \"\"\"
+    if os.path.isdir(installation):
+        marker = os.path.join(installation, "{last_used_marker}")
+    else:
+        marker = installation + "{last_used_marker}"
+    try:
+        if time.time() - os.path.getmtime(marker) < 3600:
+            return
+    except OSError:
+        pass
+
+    try:
+        open(marker, "a").close()
+        os.utime(marker, None)
+    except (IOError, OSError):
+        pass
+
+
+def _installed_version(installation):
+    \"\"\"
+    Function returns the version of awsebcli installed as `installation`,
+    a versioned virtualenv or zipapp, as recorded by the name of its package
+    metadata directory, or None if it cannot be determined.
+    \"\"\"
+    if os.path.isdir(installation):
+        metadata_directories = glob.glob(
+            os.path.join(installation, "lib", "python*", "site-packages", "awsebcli-*-info")
+        )
+    else:
+        import zipfile
+        try:
+            with zipfile.ZipFile(installation) as archive:
+                metadata_directories = set(
+                    name.split("/")[0] for name in archive.namelist()
+                    if name.startswith("awsebcli-") and name.split("/")[0].endswith("-info")
+                )
+        except (IOError, OSError, zipfile.BadZipfile):
+            metadata_directories = []
+
+    for metadata_directory in metadata_directories:
+        version = os.path.basename(metadata_directory)[len("awsebcli-"):].split("-")[0]
+        if version.endswith(".dist"):
+            version = version[:-len(".dist")]
+        return version
+
+
+def _latest_version_on_index(index_url):
+    \"\"\"
+    Function reads the simple (PEP 503) project page of awsebcli on
+    `index_url` and returns the highest final release listed on it,
+    or None if there isn't any.
+    \"\"\"
+    import re
+    try:
+        from urllib.request import urlopen
+    except ImportError:
+        from urllib2 import urlopen
+
+    response = urlopen(index_url.rstrip("/") + "/awsebcli/", timeout=10)
+    try:
+        page = response.read().decode("utf-8", "replace")
+    finally:
+        response.close()
+
+    versions = [
+        version for version in
+        re.findall(r"awsebcli-([0-9][0-9.]*?)(?:\\.tar\\.gz|\\.zip|-py)", page)
+        if _version_tuple(version)
+    ]
+    if versions:
+        return max(versions, key=_version_tuple)
+
+
+def _read_first_line(path):
+    with open(path) as file:
+        return file.readline().strip()
+
+
+def _refresh_update_check_cache():
+    \"\"\"
+    Function records the latest version of awsebcli available on the
+    package index in the update check cache. Failures to reach the index
+    are recorded too so that they are not retried before the TTL expires.
+    \"\"\"
+    try:
+        latest_version = _latest_version_on_index(
+            os.environ.get("{update_check_index_variable}") or INDEX_URL
+        ) or ""
+    except Exception:
+        latest_version = ""
+
+    temporary_cache = UPDATE_CHECK_CACHE + "." + str(os.getpid())
+    try:
+        with open(temporary_cache, "w") as file:
+            file.write(str(int(time.time())) + " " + latest_version + "\\n")
+        os.rename(temporary_cache, UPDATE_CHECK_CACHE)
+    finally:
+        if os.path.exists(UPDATE_CHECK_CACHE + ".lock"):
+            os.remove(UPDATE_CHECK_CACHE + ".lock")
+
+
+def _project_version_file():
+    \"\"\"
+    Function looks for a "{project_version_file}" file in the current working
+    directory and in each of its ancestors, and returns the path to the
+    nearest one, or None if there isn't any.
+    \"\"\"
+    directory = os.getcwd()
+    while True:
+        candidate = os.path.join(directory, "{project_version_file}")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _spawn_update_check():
+    \"\"\"
+    Function re-executes this wrapper in a detached background process
+    to refresh the update check cache. A lock file keeps concurrent `eb`
+    invocations from all spawning a check at once.
+    \"\"\"
+    lock = UPDATE_CHECK_CACHE + ".lock"
+    try:
+        if time.time() - os.path.getmtime(lock) < 300:
+            return
+    except OSError:
+        pass
+
+    try:
+        open(lock, "w").close()
+        devnull = open(os.devnull, "r+")
+        environment = dict(os.environ)
+        environment["{update_check_child}"] = "1"
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=devnull,
+            stdout=devnull,
+            stderr=devnull,
+            close_fds=True,
+            preexec_fn=os.setsid,
+            env=environment,
+        )
+    except (IOError, OSError):
+        pass
+
+
+def _selected_version():
+    \"\"\"
+    Function determines which of the installed versions of the EBCLI to
+    invoke. In decreasing order of precedence, the version is read from:
+
+        1. the `{version_variable}` environment variable
+        2. the nearest "{project_version_file}" file in or above the current
+           working directory
+        3. the "{default_pointer}" pointer written by the installer, preferring
+           the one of this user over the one of a shared installation
+    \"\"\"
+    version = os.environ.get("{version_variable}", "").strip()
+    if version:
+        return version
+
+    project_version_file = _project_version_file()
+    if project_version_file:
+        version = _read_first_line(project_version_file)
+        if version:
+            return version
+
+    for root in [EBCLI_ROOT, ENVIRONMENTS_ROOT]:
+        default_pointer = os.path.join(root, "{default_pointer}")
+        if os.path.isfile(default_pointer):
+            return _read_first_line(default_pointer)
+
+
+def _version_tuple(version):
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        return None
+
+
+if os.environ.get("{update_check_child}"):
+    _refresh_update_check_cache()
+    exit(0)
+
+version = _selected_version() or ""
+environment_directory = os.path.join(ENVIRONMENTS_ROOT, "{environments_directory}", version)
+bin_location = os.path.join(environment_directory, "bin")
+zipapp = environment_directory + "{zipapp_suffix}"
+if version and os.path.isfile(os.path.join(bin_location, "eb")):
+    installation = environment_directory
+elif version and os.path.isfile(zipapp):
+    installation = zipapp
+else:
+    sys.stderr.write(
+        'EBCLI version "' + version + '" is not installed in "' + ENVIRONMENTS_ROOT + '". '
+        'Install it by passing `--version ' + version + '` to the EBCLI installer.\\n'
+    )
+    exit(1)
+
+_record_use(installation)
+_check_for_update(installation)
+
+if installation == zipapp:
+    exit(_exec_cmd([zipapp] + sys.argv[1:]))
+
+if os.path.isdir(OVERLAY):
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        [OVERLAY] + ([os.environ["PYTHONPATH"]] if os.environ.get("PYTHONPATH") else [])
+    )
+
+activate_this = os.path.join(bin_location, "activate_this.py")
 
 if sys.version_info < (3, 0):
     execfile(activate_this, dict(__file__=activate_this))
 else:
     exec(open(activate_this).read(), dict(__file__=activate_this))
 
-exit(_exec_cmd(['{bin_location}/eb'] + sys.argv[1:]))
+exit(_exec_cmd([os.path.join(bin_location, "eb")] + sys.argv[1:]))
+"""
+}
+
+
+# Executed by the Python of a versioned virtualenv to print the command tree
+# of its awsebcli as JSON, mapping each command path to the subcommands and
+# options that may follow it.
+COMMAND_TREE_WALKER = """
+import json
+import logging
+import sys
+
+logging.disable(logging.CRITICAL)
+
+from cement.core import handler
+from ebcli.core.ebcore import EB
+
+app = EB(argv=[])
+app.setup()
+
+global_options = [
+    option for action in app.args._actions for option in action.option_strings
+]
+controllers = {}
+for controller_class in handler.list('controller'):
+    meta = controller_class()._meta
+    if meta.hide:
+        continue
+    names = [] if meta.aliases_only else [meta.label.replace('_', '-')]
+    controllers[meta.label] = dict(
+        names=names + [alias for alias in meta.aliases if alias not in names],
+        parent=meta.stacked_on if meta.stacked_type == 'nested' else None,
+        options=[
+            option
+            for flags, _ in meta.arguments
+            for option in flags
+            if option.startswith('-')
+        ],
+    )
+
+command_tree = {}
+
+def walk(label, path):
+    children = [
+        child_label for child_label, controller in sorted(controllers.items())
+        if controller['parent'] == label
+    ]
+    command_tree[path] = dict(
+        subcommands=[name for child in children for name in controllers[child]['names']],
+        options=sorted(set(global_options + controllers[label]['options'])),
+    )
+    for child in children:
+        for name in controllers[child]['names']:
+            walk(child, (path + ' ' + name).strip())
+
+walk('base', '')
+json.dump(command_tree, sys.stdout)
 """
+
+
+COMPLETION_SCRIPTS = {
+    'bash': '\n'.join(
+        [
+            '# bash completion for `eb`, generated by the EBCLI installer.',
+            '# {version_marker}{ebcli_version}',
+            '_eb_completion() {{',
+            '    local current="${{COMP_WORDS[COMP_CWORD]}}"',
+            '    local command_path=""',
+            '    local candidates=""',
+            '    local word',
+            '    local index',
+            '    for ((index = 1; index < COMP_CWORD; index++)); do',
+            '        word="${{COMP_WORDS[index]}}"',
+            '        case "${{command_path:+$command_path }}$word" in',
+            '            {command_paths}) command_path="${{command_path:+$command_path }}$word" ;;',
+            '        esac',
+            '    done',
+            '    case "$command_path" in',
+            '{cases}',
+            '    esac',
+            '    COMPREPLY=($(compgen -W "$candidates" -- "$current"))',
+            '}}',
+            'complete -F _eb_completion eb',
+            '',
+        ]
+    ),
+    'zsh': '\n'.join(
+        [
+            '#compdef eb',
+            '# zsh completion for `eb`, generated by the EBCLI installer.',
+            '# {version_marker}{ebcli_version}',
+            '_eb() {{',
+            '    local command_path=""',
+            '    local word',
+            '    local index',
+            '    local -a candidates',
+            '    for ((index = 2; index < CURRENT; index++)); do',
+            '        word="${{words[index]}}"',
+            '        case "${{command_path:+$command_path }}$word" in',
+            '            {command_paths}) command_path="${{command_path:+$command_path }}$word" ;;',
+            '        esac',
+            '    done',
+            '    case "$command_path" in',
+            '{cases}',
+            '    esac',
+            '    compadd -- "${{candidates[@]}}"',
+            '}}',
+            '_eb "$@"',
+            '',
+        ]
+    ),
+}
+
+
+COMPLETION_SCRIPT_CASES = {
+    'bash': '        "{command_path}") candidates="{candidates}" ;;',
+    'zsh': '        "{command_path}") candidates=({candidates}) ;;',
 }
 
 
+COMPLETION_SCRIPT_NAMES = {
+    'bash': 'eb_completion.bash',
+    'zsh': '_eb',
+}
+
+
+COMPLETION_VERSION_MARKER = 'awsebcli version: '
+
+
+# The `__main__` module of EBCLI zipapps. Packages that cannot be imported
+# from within a zip file are stored under "{extracted_directory}" in the
+# archive and are extracted into a cache directory by the first invocation
+# of each build of the archive.
+ZIPAPP_MAIN = """import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+BUILD_ID = "{build_id}"
+EXTRACTED_DIRECTORY = "{extracted_directory}"
+
+
+def _extract(archive):
+    cache_root = os.environ.get("{zipapp_cache_variable}") or os.path.join(
+        os.path.expanduser("~"), ".cache", "{zipapp_cache_directory}"
+    )
+    cache_directory = os.path.join(cache_root, BUILD_ID)
+    if os.path.isdir(cache_directory):
+        return cache_directory
+
+    if not os.path.isdir(cache_root):
+        try:
+            os.makedirs(cache_root)
+        except OSError:
+            # a concurrent invocation created the cache first
+            if not os.path.isdir(cache_root):
+                raise
+        open(os.path.join(cache_root, "{stamp}"), "w").close()
+    staging_directory = tempfile.mkdtemp(dir=cache_root)
+    try:
+        with zipfile.ZipFile(archive) as archive_file:
+            archive_file.extractall(
+                staging_directory,
+                [
+                    name for name in archive_file.namelist()
+                    if name.startswith(EXTRACTED_DIRECTORY + "/")
+                ]
+            )
+        os.rename(os.path.join(staging_directory, EXTRACTED_DIRECTORY), cache_directory)
+    except OSError:
+        # a concurrent invocation extracted the archive first
+        if not os.path.isdir(cache_directory):
+            raise
+    finally:
+        shutil.rmtree(staging_directory, ignore_errors=True)
+
+    return cache_directory
+
+
+sys.path.insert(1, _extract(os.path.dirname(os.path.abspath(__file__))))
+
+from ebcli.core.ebcore import main
+
+sys.exit(main())
+"""
+
+
 PATH_EXPORTER_SCRIPTS = {
     'bat': 'WSCript {path_exporter_script}\n',
     'vbs': '\n'.join(
@@ -186,6 +698,96 @@ PIP_AND_VIRTUALENV_NOT_FOUND = ' '.join(
 VIRTUALENV_DIR_NAME = '.ebcli-virtual-env'
 
 
+ENVIRONMENTS_DIR_NAME = 'versions'
+
+
+DEFAULT_ENVIRONMENT_POINTER = 'default'
+
+
+LATEST_ENVIRONMENT_NAME = 'latest'
+
+
+SOURCE_ENVIRONMENT_NAME = 'source'
+
+
+PIP_CACHE_DIR_NAME = 'pip-cache'
+
+
+PROJECT_VERSION_FILE = '.ebcli-version'
+
+
+VERSION_ENVIRONMENT_VARIABLE = 'EBCLI_VERSION'
+
+
+DEFAULT_INDEX_URL = 'https://pypi.org/simple'
+
+
+INDEX_MIRROR_PROBE_TIMEOUT_SECONDS = 5
+
+
+UPDATE_CHECK_CACHE = 'update-check'
+
+
+UPDATE_CHECK_TTL_SECONDS = 24 * 60 * 60
+
+
+UPDATE_CHECK_CHILD_ENVIRONMENT_VARIABLE = 'EBCLI_UPDATE_CHECK_CHILD'
+
+
+UPDATE_CHECK_OPT_OUT_ENVIRONMENT_VARIABLE = 'EBCLI_DISABLE_UPDATE_CHECK'
+
+
+UPDATE_CHECK_TTL_ENVIRONMENT_VARIABLE = 'EBCLI_UPDATE_CHECK_TTL'
+
+
+UPDATE_CHECK_INDEX_ENVIRONMENT_VARIABLE = 'EBCLI_UPDATE_CHECK_INDEX_URL'
+
+
+LAST_USED_MARKER = '.last_used'
+
+
+OVERLAY_DIR_NAME = 'overlay'
+
+
+SYSTEM_LOCATION = '/opt/ebcli'
+
+
+SHARED_INSTALLATION_STAMP = '.ebcli_shared_installation'
+
+
+ZIPAPP_SUFFIX = '.pyz'
+
+
+ZIPAPP_EXTRACTED_DIRECTORY = '_extracted'
+
+
+ZIPAPP_CACHE_DIR_NAME = 'ebcli-zipapp'
+
+
+ZIPAPP_CACHE_ENVIRONMENT_VARIABLE = 'EBCLI_ZIPAPP_CACHE'
+
+
+# Files that do not prevent a package from being imported from a zip file
+ZIP_SAFE_FILE_EXTENSIONS = ('.py', '.pyc', '.pyi', '.typed')
+
+
+DEFAULT_SIZE_BUDGET = '2G'
+
+
+PYENV_REPOSITORY_DIR_NAME = '.pyenv-repository'
+
+
+VIRTUALENV_BOOTSTRAP_DIR_NAME = '.ebcli-virtualenv-bootstrap'
+
+
+# Entries of ".ebcli-virtual-env" left behind by installers predating
+# versioned virtualenvs, when ".ebcli-virtual-env" itself was the virtualenv
+LEGACY_VIRTUALENV_ENTRIES = [
+    'bin', 'Scripts', 'lib', 'lib64', 'Lib', 'include', 'Include', 'share',
+    'pyvenv.cfg', 'pip-selfcheck.json',
+]
+
+
 VIRTUALENV_NOT_FOUND = ' '.join(
     [
         'ERROR: Could not find and "virtualenv" installed. Ensure'
@@ -208,54 +810,362 @@ class ArgumentError(Exception):
     pass
 
 
+class Terminal(object):
+    """
+    Class detects how colored messages can be displayed on the terminal the
+    first time one is printed, and caches the outcome for the lifetime of
+    this script:
+
+        1. through ANSI/VT100 escape sequences on Unix/Linux
+        2. through `colorama` on Windows, where CMD Prompt does not recognize
+           escape sequences; `colorama` is imported, and wraps STDOUT, then,
+           and only then
+        3. not at all when STDOUT isn't a terminal, or `colorama` isn't
+           installed
+    """
+    _lock = threading.Lock()
+    _capabilities = None
+
+    @classmethod
+    def color_sequences(cls, color_number):
+        """
+        Method returns the strings to print before and after a message to
+        display it in the color `color_number`.
+        :param color_number: an integer between and including 0 and 255
+                             representing a color
+        :return: a tuple of two strings
+        """
+        if cls._capabilities is None:
+            with cls._lock:
+                if cls._capabilities is None:
+                    cls._capabilities = cls._detect_capabilities()
+        color_template, reset_sequence, colorama_colors = cls._capabilities
+
+        if colorama_colors is not None:
+            return colorama_colors.get(color_number, ''), reset_sequence
+
+        return color_template.format(color_number=color_number), reset_sequence
+
+    @staticmethod
+    def _detect_capabilities():
+        """
+        Method returns a tuple of the template of the sequence that switches
+        to a color, the sequence that resets the color, and, when `colorama`
+        is used, the `colorama` sequences of the colors used by this script.
+        """
+        isatty = getattr(sys.stdout, 'isatty', None)
+        if not isatty or not isatty():
+            return '', '', None
+
+        if not sys.platform.startswith('win32'):
+            # Courtesy https://misc.flogisoft.com/bash/tip_colors_and_formatting
+            return '\033[38;5;{color_number}m', '\033[0m', None
+
+        try:
+            import colorama
+        except ImportError:
+            return '', '', None
+        colorama.init()
+
+        return (
+            '',
+            '\n' + colorama.Style.RESET_ALL,
+            {
+                GREEN_COLOR_CODE: colorama.Fore.GREEN,
+                RED_COLOR_CODE: colorama.Fore.RED,
+                YELLOW_COLOR_CODE: colorama.Fore.LIGHTYELLOW_EX,
+            }
+        )
+
+
+class InstallationError(Exception):
+    """
+    Class represents the failure of an installation Step. `returncode` is
+    the code this script exits with on account of the failure, and `result`
+    the `InstallationResult` of the Steps executed until the failure.
+    """
+    def __init__(self, message, returncode=1):
+        super(InstallationError, self).__init__(message)
+        self.returncode = returncode
+        self.result = None
+
+
+class Artifact(object):
+    """
+    Class describes a file or directory owned by the installers that is
+    a candidate for eviction by `--gc`.
+
+    `python_home` is the directory of the Python a virtualenv was created
+    with, and `provides_python` the directory of a Python installation;
+    a Python installation is not evicted while a virtualenv using it stays.
+    """
+    def __init__(self, description, paths, python_home=None, provides_python=None):
+        self.description = description
+        self.paths = paths
+        self.python_home = python_home
+        self.provides_python = provides_python
+        self.protected_reason = None
+        self.size, self.last_used = _scan_paths(paths)
+
+
+class IndexMirror(object):
+    """
+    Class describes a package index passed through `--index-mirror` along
+    with the outcome of probing it: the number of seconds it took to serve
+    the project page of the awsebcli, or the reason it is deemed unhealthy.
+    """
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.latency = None
+        self.error = None
+
+
+class StepResult(object):
+    """
+    Class records the outcome of a Step: "succeeded" or "failed", along with
+    the error that failed it, and the number of seconds it took.
+    """
+    def __init__(self, number, title):
+        self.number = number
+        self.title = title
+        self.outcome = None
+        self.error = None
+        self.duration = None
+
+
+class InstallationResult(object):
+    """
+    Class describes the outcome of an `EBCLIInstaller` run: the `StepResult`s
+    of its Steps in order of execution, the name of the EBCLI version
+    installed, whether installing it was skipped because it already was,
+    the URL of the package index mirror it was installed from, if any, and
+    the `Artifact`s evicted by garbage collection.
+    """
+    def __init__(self):
+        self.steps = []
+        self.environment_name = None
+        self.installation_skipped = False
+        self.index_url = None
+        self.evicted = []
+
+    @property
+    def duration(self):
+        return sum(step.duration or 0 for step in self.steps)
+
+
 class Step(object):
     """
     Class labels an installation Step and is expected to be invoked as
     the decorator of Step functions.
+
+    Steps are numbered, timed, and recorded in the `InstallationResult` of
+    the `EBCLIInstaller` run executing them. Runs are tracked per thread so
+    that installers can run concurrently.
     """
-    Step_number = 1
+    current_run = threading.local()
 
     def __init__(self, title):
         self.title = title
 
     def __call__(self, func):
         def wrapped(*args):
-            title = '{0}. {1}'.format(Step.Step_number, self.title)
+            step_results = getattr(Step.current_run, 'step_results', None)
+            if step_results is None:
+                step_results = []
+            step_result = StepResult(len(step_results) + 1, self.title)
+            step_results.append(step_result)
+
+            title = '{0}. {1}'.format(step_result.number, self.title)
             marker = '*' * len(title)
             print('\n{0}\n{1}\n{0}'.format(marker, title))
-            return_value = func(*args)
-            Step.Step_number += 1
+            start = time.time()
+            try:
+                return_value = func(*args)
+            except Exception as exception:
+                step_result.outcome = 'failed'
+                step_result.error = exception
+                raise
+            finally:
+                step_result.duration = time.time() - start
+            step_result.outcome = 'succeeded'
 
             return return_value
         return wrapped
 
 
-@Step('Activating virtualenv')
-def _activate_virtualenv(virtualenv_location):
-    """
-    Function activates virtualenv, ".ebcli-virtual-env", created apriori for the
-    rest of the lifetime of this script.
-    :param virtualenv_location: the relative or absolute path to the location
-                          where the virtualenv, ".ebcli-virtual-env", was
-                          created by this script.
-    :return None
+class EBCLIInstaller(object):
     """
-    if sys.platform.startswith('win32'):
-        activate_script_directory = 'Scripts'
-    else:
-        activate_script_directory = 'bin'
+    Class carries out what this script does, but in-process, so that
+    a long-lived program can drive many installations without starting an
+    interpreter for each of them:
 
-    activate_this_path = os.path.join(
-        virtualenv_location,
-        VIRTUALENV_DIR_NAME,
-        activate_script_directory,
-        'activate_this.py'
-    )
+        from ebcli_installer import EBCLIInstaller
 
-    if sys.version_info < (3, 0):
-        execfile(activate_this_path, dict(__file__=activate_this_path))
-    else:
-        exec(open(activate_this_path).read(), dict(__file__=activate_this_path))
+        result = EBCLIInstaller(version='3.14.13', location='/opt/ebcli', quiet=True).run()
+        for step in result.steps:
+            print(step.number, step.title, step.outcome, step.duration)
+
+    The options are keyword arguments named after the command-line
+    arguments, such as `python_installation` for "--python-installation",
+    and default to the same values. Incompatible options raise
+    `ArgumentError` and failed Steps raise `InstallationError`, rather than
+    exiting.
+
+    Installers may run concurrently from several threads as long as they
+    use distinct locations.
+    """
+    def __init__(self, **options):
+        option_defaults = vars(_argument_parser().parse_args([]))
+        unknown_options = set(options) - set(option_defaults)
+        if unknown_options:
+            raise ArgumentError(
+                'Unknown options: {}'.format(', '.join(sorted(unknown_options)))
+            )
+        self.options = argparse.Namespace(**dict(option_defaults, **options))
+        if not isinstance(self.options.size_budget, int):
+            try:
+                self.options.size_budget = _parse_size(str(self.options.size_budget))
+            except argparse.ArgumentTypeError as exception:
+                raise ArgumentError(str(exception))
+        _validate_arguments(self.options)
+
+    def run(self):
+        """
+        Method collects garbage if the "gc" option is set, links to the
+        "shared_installation" if it is set, and installs the EBCLI
+        otherwise.
+        :return: an `InstallationResult`
+        :raises InstallationError: when a Step fails; the `InstallationResult`
+                                   of the Steps executed is attached to it
+        """
+        result = InstallationResult()
+        enclosing_step_results = getattr(Step.current_run, 'step_results', None)
+        Step.current_run.step_results = result.steps
+        try:
+            self._run(result)
+        except InstallationError as exception:
+            exception.result = result
+            raise
+        finally:
+            Step.current_run.step_results = enclosing_step_results
+
+        return result
+
+    def _run(self, result):
+        options = self.options
+        virtualenv_location = (
+            options.location
+            or (options.system and SYSTEM_LOCATION)
+            or _user_local_directory()
+        )
+        if options.gc:
+            result.evicted = _collect_garbage(
+                _inventory_artifacts(virtualenv_location, options.gc_shared),
+                options.size_budget,
+                options.dry_run
+            )
+            return
+
+        if options.shared_installation:
+            _link_shared_installation(
+                virtualenv_location,
+                options.shared_installation,
+                options.version and options.version.strip(),
+                options.overlay
+            )
+            _generate_ebcli_wrappers(
+                virtualenv_location,
+                options.shared_installation,
+                None,
+                options.python_installation
+            )
+            if options.version:
+                result.environment_name = options.version.strip()
+                _select_default_environment(
+                    virtualenv_location,
+                    result.environment_name
+                )
+            _announce_success(
+                virtualenv_location,
+                options.hide_export_recommendation
+            )
+            return
+
+        environment_name = result.environment_name = _environment_name(
+            options.version,
+            options.ebcli_source
+        )
+        if _environment_is_installed(
+                virtualenv_location,
+                environment_name,
+                options.zipapp
+        ):
+            result.installation_skipped = True
+            _print_success_message(
+                'EBCLI {} is already installed. Skipping installation.'.format(
+                    environment_name
+                )
+            )
+        else:
+            index_mirrors = []
+            if options.index_mirrors:
+                index_mirrors = _rank_index_mirrors(
+                    options.index_mirrors,
+                    options.version and options.version.strip()
+                )
+            if options.zipapp:
+                result.index_url = _build_zipapp(
+                    virtualenv_location,
+                    environment_name,
+                    options.python_installation,
+                    options.version,
+                    options.ebcli_source,
+                    options.quiet,
+                    index_mirrors
+                )
+            else:
+                virtualenv = (
+                    options.virtualenv_executable
+                    or _locate_virtualenv_executable()
+                )
+                _create_virtualenv(
+                    virtualenv,
+                    virtualenv_location,
+                    options.python_installation,
+                    options.quiet,
+                    environment_name
+                )
+                result.index_url = _install_ebcli(
+                    options.quiet,
+                    options.version,
+                    options.ebcli_source,
+                    virtualenv_location,
+                    environment_name,
+                    index_mirrors
+                )
+        _generate_ebcli_wrappers(
+            virtualenv_location,
+            None,
+            result.index_url,
+            options.python_installation
+        )
+        if not options.zipapp:
+            _generate_completion_scripts(
+                virtualenv_location,
+                environment_name,
+                options.quiet
+            )
+        _select_default_environment(virtualenv_location, environment_name)
+        if options.system:
+            _seal_shared_installation(
+                virtualenv_location,
+                environment_name,
+                options.quiet
+            )
+        _announce_success(
+            virtualenv_location,
+            options.hide_export_recommendation
+        )
 
 
 @Step('Finishing up')
@@ -341,35 +1251,18 @@ def _print_in_foreground(message, color_number):
 
         https://misc.flogisoft.com/bash/tip_colors_and_formatting#background1
 
-    On Windows, `color_number` is rejected, and hence not used. At present, PowerShell
-    is able to recognize ANSI/VT100 escape sequences, however, CMD prompt is not.
+    On Windows, only the colors used by this script are displayed, through
+    `colorama`. At present, PowerShell is able to recognize ANSI/VT100 escape
+    sequences, however, CMD prompt is not. See `Terminal`.
 
     :param message: a string to print in the foreground on the terminal
     :param color_number: an integer between and including 0 and 255 representing
                          a color
     :return: None
     """
-    if sys.platform.startswith('win32'):
-        import colorama
-        colorama.init()
-        if color_number == GREEN_COLOR_CODE:
-            print(colorama.Fore.GREEN + message)
-        elif color_number == RED_COLOR_CODE:
-            print(colorama.Fore.RED + message)
-        elif color_number == YELLOW_COLOR_CODE:
-            print(colorama.Fore.LIGHTYELLOW_EX + message)
-        else:
-            print(message)
-        print(colorama.Style.RESET_ALL)
+    color_sequence, reset_sequence = Terminal.color_sequences(color_number)
+    print(color_sequence + message + reset_sequence)
 
-    else:
-        # Courtesy https://misc.flogisoft.com/bash/tip_colors_and_formatting
-        print(
-            "\033[38;5;{color_number}m{message}\033[0m".format(
-                color_number=color_number,
-                message=message,
-            )
-        )
 
 def _print_recommendation_message(message):
     _print_in_foreground(message, YELLOW_COLOR_CODE)
@@ -383,16 +1276,325 @@ def _print_error_message(message):
     _print_in_foreground(message, RED_COLOR_CODE)
 
 
-@Step('Creating exclusive virtualenv for EBCLI')
-def _create_virtualenv(
-        virtualenv_executable,
+@Step('Linking to shared EBCLI installation')
+def _link_shared_installation(
         virtualenv_location,
-        python_installation,
-        quiet
+        shared_location,
+        environment_name,
+        overlay
 ):
     """
-    Function creates a new virtualenv at path `virtualenv_location`
-    using the Python at path `python_installation`, if one is provided.
+    Function prepares ".ebcli-virtual-env" at `virtualenv_location` to hold
+    only the `eb` wrappers of a user of the shared installation at
+    `shared_location`, rather than virtualenvs of its own, and copies the
+    shell completion scripts of the shared installation next to them.
+
+    When `environment_name` is passed, it becomes the user's default version
+    of the EBCLI, overriding the default of the shared installation. When
+    `overlay` is passed, an "overlay" directory is created which the
+    wrappers prepend to PYTHONPATH, so that the user can install additional
+    packages using `pip install --target`.
+
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the user's ".ebcli-virtual-env" must be
+                                created.
+    :param shared_location: the relative or absolute path to the location of
+                            the shared installation
+    :param environment_name: the name of a versioned virtualenv of the shared
+                             installation, or None
+    :param overlay: whether to create a per-user overlay directory
+    :return: None
+    :raises InstallationError: if `shared_location` is not a shared
+                               installation, or lacks `environment_name`.
+    """
+    shared_directory = os.path.join(os.path.abspath(shared_location), VIRTUALENV_DIR_NAME)
+    if not _directory_was_created_by_installer(shared_directory):
+        _error(
+            '"{}" is not an EBCLI installation created by this installer.'.format(
+                shared_directory
+            )
+        )
+    if environment_name and not os.path.isdir(
+        _original_eb_location(shared_location, environment_name)
+    ):
+        _error(
+            'EBCLI {} is not installed in the shared installation at "{}".'.format(
+                environment_name,
+                shared_directory
+            )
+        )
+
+    virtualenv_directory = os.path.join(os.path.abspath(virtualenv_location), VIRTUALENV_DIR_NAME)
+    _ensure_directory_is_absent_or_created_by_installer(virtualenv_directory)
+    executables_dir = _eb_wrapper_location(virtualenv_location)
+    not os.path.exists(executables_dir) and os.makedirs(executables_dir)
+    _add_ebcli_stamp(virtualenv_directory)
+
+    overlay_directory = os.path.join(virtualenv_directory, OVERLAY_DIR_NAME)
+    if overlay and not os.path.exists(overlay_directory):
+        os.mkdir(overlay_directory)
+
+    for script_name in COMPLETION_SCRIPT_NAMES.values():
+        shared_script_path = os.path.join(_eb_wrapper_location(shared_location), script_name)
+        if os.path.exists(shared_script_path):
+            shutil.copy(shared_script_path, executables_dir)
+
+
+@Step('Precompiling and sealing shared installation')
+def _seal_shared_installation(virtualenv_location, environment_name, quiet):
+    """
+    Function prepares the installation at `virtualenv_location` for use by
+    all of the users of this computer: the modules of the versioned
+    virtualenv, `environment_name`, are compiled to bytecode ahead of time
+    because users lack the permissions to write the bytecode themselves, and
+    ".ebcli-virtual-env", apart from its pip cache, is made readable, but
+    not writable, by everyone other than its owner. `SHARED_INSTALLATION_STAMP`
+    is added to ".ebcli-virtual-env" so that `--gc` keeps its versions.
+
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :param environment_name: the name of the versioned virtualenv to compile
+    :param quiet: whether to display the output of compilation to the terminal
+                  or not
+    :return: None
+    """
+    environment_directory = _environment_directory(virtualenv_location, environment_name)
+    _exec_cmd(
+        [
+            '"{}"'.format(os.path.join(_original_eb_location(virtualenv_location, environment_name), 'python')),
+            '-m', 'compileall', '-q',
+            '"{}"'.format(environment_directory)
+        ],
+        quiet
+    )
+
+    virtualenv_directory = os.path.join(os.path.abspath(virtualenv_location), VIRTUALENV_DIR_NAME)
+    open(os.path.join(virtualenv_directory, SHARED_INSTALLATION_STAMP), 'w').close()
+    if sys.platform.startswith('win32'):
+        return
+
+    for directory, directory_names, file_names in os.walk(virtualenv_directory):
+        if PIP_CACHE_DIR_NAME in directory_names and directory == virtualenv_directory:
+            directory_names.remove(PIP_CACHE_DIR_NAME)
+        for path in [directory] + [os.path.join(directory, name) for name in file_names]:
+            if os.path.islink(path):
+                continue
+            mode = os.stat(path).st_mode
+            mode |= stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+            if os.path.isdir(path) or mode & stat.S_IXUSR:
+                mode |= stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+            os.chmod(path, mode & ~(stat.S_IWGRP | stat.S_IWOTH))
+
+
+@Step('Taking inventory of artifacts owned by the installer')
+def _inventory_artifacts(virtualenv_location, gc_shared):
+    """
+    Function lists the artifacts created by the EBCLI installer and by
+    `bundled_installer`, which are recognized by the `EBCLI_INSTALLER_STAMP`
+    they carry:
+
+        1. the versioned virtualenvs and zipapps inside ".ebcli-virtual-env"
+        2. the pip cache shared by these virtualenvs
+        3. the virtualenv created by installers predating versioned
+           virtualenvs within ".ebcli-virtual-env"
+        4. Python installations built through pyenv
+        5. the clone of the pyenv repository
+        6. the virtualenv used to bootstrap `virtualenv`
+        7. the directory zipapps extract their compiled packages into
+
+    The virtualenvs the `eb` wrappers would presently select, the Python
+    installation executing this script, and the Python installation the `eb`
+    wrapper is run with, are protected. So are all of the versioned
+    virtualenvs of a shared installation, unless `gc_shared` is set: the
+    versions its users select, and when they last used them, are recorded in
+    their own ".ebcli-virtual-env" directories, out of sight of this script.
+
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :param gc_shared: whether the versioned virtualenvs of a shared
+                      installation may be evicted
+    :return: a list of `Artifact`s
+    """
+    artifacts = []
+    virtualenv_directory = os.path.join(
+        os.path.abspath(virtualenv_location),
+        VIRTUALENV_DIR_NAME
+    )
+    if _directory_was_created_by_installer(virtualenv_directory):
+        active_environment_names = _active_environment_names(virtualenv_location)
+        protect_shared_environments = not gc_shared and os.path.exists(
+            os.path.join(virtualenv_directory, SHARED_INSTALLATION_STAMP)
+        )
+        environments_directory = os.path.join(virtualenv_directory, ENVIRONMENTS_DIR_NAME)
+        for environment_name in _list_directory(environments_directory):
+            environment_directory = os.path.join(environments_directory, environment_name)
+            if environment_name.endswith(ZIPAPP_SUFFIX):
+                environment_name = environment_name[:-len(ZIPAPP_SUFFIX)]
+                paths = [environment_directory]
+                if os.path.exists(environment_directory + LAST_USED_MARKER):
+                    paths.append(environment_directory + LAST_USED_MARKER)
+                artifact = Artifact('EBCLI {} (zipapp)'.format(environment_name), paths)
+                if environment_name in active_environment_names:
+                    artifact.protected_reason = 'active version'
+                artifacts.append(artifact)
+                continue
+
+            if not _directory_was_created_by_installer(environment_directory):
+                continue
+
+            artifact = Artifact(
+                'EBCLI {}'.format(environment_name),
+                [environment_directory],
+                python_home=_virtualenv_python_home(environment_directory)
+            )
+            if environment_name in active_environment_names:
+                artifact.protected_reason = 'active version'
+            elif protect_shared_environments:
+                artifact.protected_reason = 'shared installation'
+            artifacts.append(artifact)
+
+        pip_cache_directory = os.path.join(virtualenv_directory, PIP_CACHE_DIR_NAME)
+        if os.path.exists(pip_cache_directory):
+            artifacts.append(Artifact('pip cache', [pip_cache_directory]))
+
+        legacy_entries = [
+            os.path.join(virtualenv_directory, entry)
+            for entry in LEGACY_VIRTUALENV_ENTRIES
+            if os.path.lexists(os.path.join(virtualenv_directory, entry))
+        ]
+        if os.path.exists(os.path.join(virtualenv_directory, 'pyvenv.cfg')) or any(
+            os.path.exists(os.path.join(virtualenv_directory, scripts_directory, 'activate_this.py'))
+            for scripts_directory in ['bin', 'Scripts']
+        ):
+            artifacts.append(
+                Artifact(
+                    'EBCLI (unversioned legacy installation)',
+                    legacy_entries,
+                    python_home=_virtualenv_python_home(virtualenv_directory)
+                )
+            )
+
+    home = os.path.expanduser('~')
+    pyenv_versions_directory = os.path.join(
+        os.environ.get('PYENV_ROOT') or os.path.join(home, '.pyenv'),
+        'versions'
+    )
+    for python_version in _list_directory(pyenv_versions_directory):
+        python_directory = os.path.join(pyenv_versions_directory, python_version)
+        if _directory_was_created_by_installer(python_directory):
+            artifacts.append(
+                Artifact(
+                    'Python {}'.format(python_version),
+                    [python_directory],
+                    provides_python=python_directory
+                )
+            )
+
+    pyenv_repository_directory = os.path.join(home, PYENV_REPOSITORY_DIR_NAME)
+    if _directory_was_created_by_installer(pyenv_repository_directory):
+        artifacts.append(Artifact('pyenv repository', [pyenv_repository_directory]))
+
+    bootstrap_directory = os.path.join(home, VIRTUALENV_BOOTSTRAP_DIR_NAME)
+    if _directory_was_created_by_installer(bootstrap_directory):
+        artifacts.append(
+            Artifact(
+                'virtualenv bootstrap',
+                [bootstrap_directory],
+                python_home=_virtualenv_python_home(bootstrap_directory),
+                provides_python=bootstrap_directory
+            )
+        )
+
+    zipapp_cache_directory = os.environ.get(ZIPAPP_CACHE_ENVIRONMENT_VARIABLE) or os.path.join(
+        home,
+        '.cache',
+        ZIPAPP_CACHE_DIR_NAME
+    )
+    if _directory_was_created_by_installer(zipapp_cache_directory):
+        artifacts.append(Artifact('zipapp extraction cache', [zipapp_cache_directory]))
+
+    wrapper_interpreters = _wrapper_interpreters(virtualenv_location)
+    for artifact in artifacts:
+        if not artifact.provides_python:
+            continue
+        if _path_is_within(sys.prefix, artifact.provides_python):
+            artifact.protected_reason = 'executing this script'
+        elif any(
+            _path_is_within(interpreter, artifact.provides_python)
+            for interpreter in wrapper_interpreters
+        ):
+            artifact.protected_reason = 'running the `eb` wrapper'
+
+    return artifacts
+
+
+@Step('Evicting least recently used artifacts')
+def _collect_garbage(artifacts, size_budget, dry_run):
+    """
+    Function evicts the least recently used of `artifacts` until their
+    combined size is within `size_budget`. Protected artifacts, and Python
+    installations still used by a remaining virtualenv, are never evicted.
+    After every eviction, the search restarts from the least recently used
+    artifact because evicting a virtualenv may free up the Python installation
+    it was created with.
+
+    :param artifacts: a list of `Artifact`s as returned by `_inventory_artifacts`
+    :param size_budget: the number of bytes the artifacts may occupy
+    :param dry_run: whether to only report what would be evicted
+    :return: the list of `Artifact`s (to be) evicted
+    """
+    total_size = sum(artifact.size for artifact in artifacts)
+    candidates = sorted(
+        [artifact for artifact in artifacts if not artifact.protected_reason],
+        key=lambda artifact: artifact.last_used
+    )
+    evicted = []
+    evicted_artifact = True
+    while total_size > size_budget and evicted_artifact:
+        evicted_artifact = None
+        for artifact in candidates:
+            if artifact in evicted or _python_is_in_use(artifact, artifacts, evicted):
+                continue
+            evicted_artifact = artifact
+            break
+
+        if evicted_artifact:
+            evicted.append(evicted_artifact)
+            total_size -= evicted_artifact.size
+
+    if not dry_run:
+        for artifact in evicted:
+            for path in artifact.paths:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+    _print_garbage_collection_report(
+        artifacts,
+        evicted,
+        total_size,
+        size_budget,
+        dry_run
+    )
+
+    return evicted
+
+
+@Step('Creating exclusive virtualenv for EBCLI')
+def _create_virtualenv(
+        virtualenv_executable,
+        virtualenv_location,
+        python_installation,
+        quiet,
+        environment_name
+):
+    """
+    Function creates a new virtualenv for the EBCLI version, `environment_name`,
+    under ".ebcli-virtual-env/versions" at path `virtualenv_location`
+    using the Python at path `python_installation`, if one is provided.
     If `virtualenv_location` is not provided, the user's HOME directory
     is assumed as the location to create the virtualenv in. If
     `python_installation` is not provided, virtualenv attempts to
@@ -408,8 +1610,10 @@ def _create_virtualenv(
     is asked to either delete the directory or to specify an alternate
     location using the `--location` argument of this script.
 
-    In all other cases, `.ebcli-virtual-env` is (re)created and a file
-    to denote that the installer created `.ebcli-virtual-env` is added.
+    In all other cases, `.ebcli-virtual-env/versions/<environment_name>`
+    is (re)created and a file to denote that the installer created it and
+    `.ebcli-virtual-env` is added to each of them. Other versions installed
+    alongside are left untouched.
 
     :param virtualenv_executable: the name of the virtualenv executable
     :param virtualenv_location: the relative or absolute path to the location
@@ -420,35 +1624,28 @@ def _create_virtualenv(
                                 virtualenv with
     :param quiet: whether to display the output of virtualenv creation in
                   STDOUT or not
+    :param environment_name: the name of the versioned virtualenv to create
 
     :return the relative or absolute path to the location where the
             virtualenv, ".ebcli-virtual-env", was created.
     """
     virtualenv_location = virtualenv_location or _user_local_directory()
     virtualenv_directory = os.path.join(virtualenv_location, VIRTUALENV_DIR_NAME)
+    environment_directory = _environment_directory(
+        virtualenv_location,
+        environment_name
+    )
     python_installation = python_installation or sys.executable
 
-    if (
-        os.path.exists(virtualenv_directory)
-        and not _directory_was_created_by_installer(virtualenv_directory)
-    ):
-        _error(
-            'Installation cannot proceed because "{virtualenv_location}" already exists '
-                'but was not created by this EBCLI installer.'
-            '\n'
-            '\n'
-            'You can either:\n'
-            '\n'
-            '1. Delete "{virtualenv_location}" after verifying you don\'t need it; OR\n'
-            '2. Specify an alternate location to install the EBCLI and its artifacts in '
-                'using the `--location` argument of this script .\n'.format(
-                virtualenv_location=virtualenv_directory
-            )
-        )
+    _ensure_directory_is_absent_or_created_by_installer(virtualenv_directory)
+
+    environments_directory = os.path.dirname(environment_directory)
+    not os.path.exists(environments_directory) and os.makedirs(environments_directory)
+    _add_ebcli_stamp(virtualenv_directory)
 
     virtualenv_args = [
         virtualenv_executable or 'virtualenv',
-        '"{}"'.format(virtualenv_directory)
+        '"{}"'.format(environment_directory)
     ]
 
     python_installation and virtualenv_args.extend(
@@ -456,9 +1653,11 @@ def _create_virtualenv(
     )
 
     if _exec_cmd(virtualenv_args, quiet) != 0:
-        exit(1)
+        raise InstallationError(
+            'Could not create a virtualenv at "{}".'.format(environment_directory)
+        )
 
-    _add_ebcli_stamp(virtualenv_directory)
+    _add_ebcli_stamp(environment_directory)
 
     return virtualenv_location
 
@@ -495,8 +1694,72 @@ def _locate_virtualenv_executable():
     return virtualenv_executable
 
 
+@Step('Probing package index mirrors')
+def _rank_index_mirrors(index_mirror_urls, version):
+    """
+    Function probes the package indexes at `index_mirror_urls` concurrently
+    by fetching the simple (PEP 503) project page of the awsebcli from each,
+    and returns the healthy ones, fastest first. A mirror is deemed unhealthy
+    when it cannot serve the page within `INDEX_MIRROR_PROBE_TIMEOUT_SECONDS`,
+    or when the page doesn't list `version`, which suggests that the mirror
+    is lagging behind.
+
+    The outcome of probing every mirror, and the mirror chosen, are printed.
+
+    :param index_mirror_urls: a list of URLs of package indexes
+    :param version: the specific version of awsebcli to install, if any
+    :return: a list of the healthy `IndexMirror`s ordered by latency
+    :raises InstallationError: if none of the mirrors is healthy
+    """
+    mirrors = [IndexMirror(url) for url in index_mirror_urls]
+    probes = [
+        threading.Thread(target=_probe_index_mirror, args=(mirror, version))
+        for mirror in mirrors
+    ]
+    for probe in probes:
+        probe.daemon = True
+        probe.start()
+
+    deadline = time.time() + INDEX_MIRROR_PROBE_TIMEOUT_SECONDS + 1
+    outcomes = []
+    for mirror, probe in zip(mirrors, probes):
+        probe.join(max(deadline - time.time(), 0))
+        if probe.is_alive():
+            outcomes.append((mirror, None, 'timed out'))
+        else:
+            outcomes.append((mirror, mirror.latency, mirror.error))
+
+    for mirror, latency, error in outcomes:
+        if error:
+            print('unhealthy  {0}: {1}'.format(mirror.url, error))
+        else:
+            print('healthy    {0}: {1:.0f} ms'.format(mirror.url, latency * 1000))
+
+    healthy_mirrors = sorted(
+        [mirror for mirror, _, error in outcomes if not error],
+        key=lambda mirror: mirror.latency
+    )
+    if not healthy_mirrors:
+        _error('None of the package index mirrors is healthy.')
+
+    _print_success_message(
+        'Selected {0}: the fastest of {1} healthy mirror(s). The others, fastest first, '
+        'are used if installation from it fails.'.format(
+            healthy_mirrors[0].url,
+            len(healthy_mirrors)
+        )
+    )
+
+    return healthy_mirrors
+
+
 @Step('Creating EB wrappers')
-def _generate_ebcli_wrappers(virtualenv_location):
+def _generate_ebcli_wrappers(
+        virtualenv_location,
+        shared_location=None,
+        index_url=None,
+        python_installation=None
+):
     """
     Function generates:
         - a Python wrapper for the awsebcli on Unix/Linux computers; OR
@@ -508,6 +1771,14 @@ def _generate_ebcli_wrappers(virtualenv_location):
     :param virtualenv_location: the relative or absolute path to the location
                           where the virtualenv, ".ebcli-virtual-env",
                           exists.
+    :param shared_location: the relative or absolute path to the location of
+                            a shared installation whose versioned virtualenvs
+                            the wrappers should invoke instead of those
+                            within `virtualenv_location`
+    :param index_url: the URL of the package index to check for new versions
+                      of the EBCLI
+    :param python_installation: the Python to execute the Unix/Linux wrapper
+                                with; see `_wrapper_interpreter`
     :return None
     """
     executables_dir = _eb_wrapper_location(virtualenv_location)
@@ -519,45 +1790,348 @@ def _generate_ebcli_wrappers(virtualenv_location):
 
     if sys.platform.startswith('win32'):
         with open(ebcli_ps1_script_path, 'w') as script:
-            script.write(_powershell_script_body(virtualenv_location))
+            script.write(_powershell_script_body(virtualenv_location, shared_location, index_url))
 
         with open(ebcli_bat_script_path, 'w') as script:
-            script.write(_bat_script_body(virtualenv_location))
+            script.write(_bat_script_body(virtualenv_location, shared_location, index_url))
     else:
         with open(ebcli_script_path, 'w') as script:
-            script.write(_python_script_body(virtualenv_location))
+            script.write(
+                _python_script_body(
+                    virtualenv_location,
+                    shared_location,
+                    index_url,
+                    python_installation
+                )
+            )
         _exec_cmd(['chmod', '+x', ebcli_script_path], False)
 
 
+@Step('Generating shell completion scripts')
+def _generate_completion_scripts(virtualenv_location, environment_name, quiet):
+    """
+    Function walks the command tree of the awsebcli installed in the
+    versioned virtualenv, `environment_name`, once and writes static bash
+    and zsh completion scripts into the "executables" directory, so that
+    completing `eb` commands never has to start a Python interpreter.
+
+    The scripts record the version of the awsebcli they were generated
+    from and are only regenerated when it changes; they are not generated
+    when that version cannot be determined. Failure to walk the command
+    tree is not fatal to the installation.
+
+    Completion scripts are not generated on Windows.
+
+    :param virtualenv_location: the relative or absolute path to the location
+                          where the virtualenv, ".ebcli-virtual-env",
+                          exists.
+    :param environment_name: the name of the versioned virtualenv
+    :param quiet: whether to display the reason completion scripts could not
+                  be generated
+    :return None
+    """
+    if sys.platform.startswith('win32'):
+        return
+
+    ebcli_version = _installed_ebcli_version(virtualenv_location, environment_name)
+    if not ebcli_version:
+        if not quiet:
+            _print_recommendation_message(
+                'Could not determine the version of the awsebcli installed in "{}"; '
+                'shell completion scripts were not generated.'.format(environment_name)
+            )
+        return
+
+    executables_dir = _eb_wrapper_location(virtualenv_location)
+    bash_script_path = os.path.join(executables_dir, COMPLETION_SCRIPT_NAMES['bash'])
+    if os.path.exists(bash_script_path):
+        with open(bash_script_path) as file:
+            if '# {}{}\n'.format(COMPLETION_VERSION_MARKER, ebcli_version) in file.readlines()[:3]:
+                return
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            command_tree = json.loads(
+                subprocess.check_output(
+                    [
+                        os.path.join(
+                            _original_eb_location(virtualenv_location, environment_name),
+                            'python'
+                        ),
+                        '-c',
+                        COMMAND_TREE_WALKER
+                    ],
+                    stderr=devnull if quiet else None
+                ).decode('utf-8')
+            )
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        if not quiet:
+            _print_recommendation_message(
+                'Could not walk the command tree of awsebcli {}; '
+                'shell completion scripts were not generated.'.format(ebcli_version)
+            )
+        return
+
+    for shell, script_name in COMPLETION_SCRIPT_NAMES.items():
+        with open(os.path.join(executables_dir, script_name), 'w') as script:
+            script.write(_completion_script_body(shell, ebcli_version, command_tree))
+
+
+@Step('Building EBCLI zipapp')
+def _build_zipapp(
+        virtualenv_location,
+        environment_name,
+        python_installation,
+        version,
+        ebcli_source,
+        quiet,
+        index_mirrors
+):
+    """
+    Function builds a single executable zip file (.pyz) containing the
+    awsebcli and its dependencies as an alternative to a virtualenv, at
+    ".ebcli-virtual-env/versions/<environment_name>.pyz".
+
+    The packages are installed using `pip install --target` of the Python at
+    `python_installation`, which the archive is bound to through its shebang,
+    and are compiled ahead of time; to legacy bytecode locations in the case
+    of modules imported from within the archive, as `zipimport` requires.
+    Top-level packages containing files other than Python modules, such as
+    compiled extensions or data files read through the filesystem, cannot be
+    imported from within the archive; these are stored apart in the archive
+    and are extracted into a cache directory, once per build, by the
+    archive's `__main__` module.
+
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                must be created.
+    :param environment_name: the name to give the archive
+    :param python_installation: the relative or absolute path to, or the name
+                                in PATH of, a Python executable to build the
+                                archive for
+    :param version: the specific version of awsebcli to install
+    :param ebcli_source: filesystem path to the source of the EBCLI to install
+    :param quiet: whether to display the output of awsebcli installation to
+                  the terminal or not
+    :param index_mirrors: a list of `IndexMirror`s to install from, in order
+                          of preference
+    :return: the URL of the package index mirror the EBCLI was installed
+             from, if any
+    """
+    try:
+        import zipapp
+    except ImportError:
+        _error('Building a zipapp requires executing this script with Python 3.5 or later.')
+    import hashlib
+    import tempfile
+
+    python_executable = _resolve_python_installation(python_installation)
+    if not python_executable:
+        _error('Could not find the Python executable "{}" in PATH.'.format(python_installation))
+    virtualenv_directory = os.path.join(os.path.abspath(virtualenv_location), VIRTUALENV_DIR_NAME)
+    _ensure_directory_is_absent_or_created_by_installer(virtualenv_directory)
+    environments_directory = os.path.join(virtualenv_directory, ENVIRONMENTS_DIR_NAME)
+    not os.path.exists(environments_directory) and os.makedirs(environments_directory)
+    _add_ebcli_stamp(virtualenv_directory)
+
+    staging_directory = tempfile.mkdtemp()
+    try:
+        if ebcli_source:
+            requirement = ebcli_source.strip()
+        elif version:
+            requirement = 'awsebcli=={}'.format(version.strip())
+        else:
+            requirement = 'awsebcli'
+        returncode, index_url = _exec_pip_install(
+            [
+                '"{}"'.format(python_executable), '-m', 'pip', 'install',
+                '--target', '"{}"'.format(staging_directory),
+                '--cache-dir', '"{}"'.format(os.path.join(virtualenv_directory, PIP_CACHE_DIR_NAME)),
+                '"{}"'.format(requirement),
+            ],
+            index_mirrors,
+            quiet
+        )
+        if returncode != 0:
+            raise InstallationError(
+                'Installation of the EBCLI failed with exit code {}.'.format(returncode),
+                returncode
+            )
+        shutil.rmtree(os.path.join(staging_directory, 'bin'), ignore_errors=True)
+
+        extracted_directory = os.path.join(staging_directory, ZIPAPP_EXTRACTED_DIRECTORY)
+        os.mkdir(extracted_directory)
+        build_hash = hashlib.sha256()
+        for entry in sorted(os.listdir(staging_directory)):
+            entry_path = os.path.join(staging_directory, entry)
+            if entry == ZIPAPP_EXTRACTED_DIRECTORY or entry.endswith('-info') or _is_zip_safe(entry_path):
+                continue
+            shutil.move(entry_path, extracted_directory)
+            for directory, _, file_names in sorted(os.walk(os.path.join(extracted_directory, entry))):
+                for file_name in sorted(file_names):
+                    with open(os.path.join(directory, file_name), 'rb') as file:
+                        build_hash.update(file.read())
+
+        for directory, directory_names, _ in os.walk(staging_directory):
+            if '__pycache__' in directory_names:
+                shutil.rmtree(os.path.join(directory, '__pycache__'))
+                directory_names.remove('__pycache__')
+        # Bytecode is not validated against the modification times of the
+        # sources, which change upon extraction. Modules that fail to compile,
+        # such as examples shipped by some packages, are left to be compiled,
+        # or not, when imported.
+        _exec_cmd(
+            [
+                '"{}"'.format(python_executable), '-m', 'compileall', '-q', '-b',
+                '--invalidation-mode', 'unchecked-hash',
+                '-x', '"{}"'.format(re.escape(ZIPAPP_EXTRACTED_DIRECTORY)),
+                '"{}"'.format(staging_directory)
+            ],
+            True
+        )
+        _exec_cmd(
+            [
+                '"{}"'.format(python_executable), '-m', 'compileall', '-q',
+                '--invalidation-mode', 'unchecked-hash',
+                '"{}"'.format(extracted_directory)
+            ],
+            True
+        )
+
+        with open(os.path.join(staging_directory, '__main__.py'), 'w') as main_module:
+            main_module.write(
+                ZIPAPP_MAIN.format(
+                    build_id=build_hash.hexdigest()[:16],
+                    extracted_directory=ZIPAPP_EXTRACTED_DIRECTORY,
+                    stamp=EBCLI_INSTALLER_STAMP,
+                    zipapp_cache_directory=ZIPAPP_CACHE_DIR_NAME,
+                    zipapp_cache_variable=ZIPAPP_CACHE_ENVIRONMENT_VARIABLE,
+                )
+            )
+        zipapp.create_archive(
+            staging_directory,
+            _environment_directory(virtualenv_location, environment_name) + ZIPAPP_SUFFIX,
+            interpreter=python_executable
+        )
+    finally:
+        shutil.rmtree(staging_directory, ignore_errors=True)
+
+    return index_url
+
+
 @Step('Installing EBCLI')
-def _install_ebcli(quiet, version, ebcli_source):
+def _install_ebcli(
+        quiet,
+        version,
+        ebcli_source,
+        virtualenv_location,
+        environment_name,
+        index_mirrors
+):
     """
-    Function installs the awsebcli presumably within the virtualenv,
-    ".ebcli-virtual-env", created and activated by this script apriori.
+    Function installs the awsebcli within the versioned virtualenv,
+    `environment_name`, inside ".ebcli-virtual-env", created by this script
+    apriori, using the pip of the virtualenv rather than activating it,
+    which would affect every installation running in this process.
     If `version` is passed, the specific version of the EBCLI is installed.
 
     The presence of `version` and `ebcli_source` will lead to an exception
     as they represent two different ways of installing the EBCLI.
 
+    pip is pointed at a cache directory shared by all of the versions
+    installed under ".ebcli-virtual-env" so that wheels downloaded or built
+    for one version are reused by the others.
+
     :param quiet: whether to display the output of awsebcli installation to
                   the terminal or not
     :param version: the specific version of awsebcli to install
-    :return None
+    :param ebcli_source: filesystem path to the source of the EBCLI to install
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :param environment_name: the name of the versioned virtualenv
+    :param index_mirrors: a list of `IndexMirror`s to install from, in order
+                          of preference
+    :return: the URL of the package index mirror the EBCLI was installed
+             from, if any
+    :raises InstallationError: if pip fails to install the EBCLI
     """
+    pip_args = [
+        '"{}"'.format(
+            os.path.join(_original_eb_location(virtualenv_location, environment_name), 'python')
+        ),
+        '-m', 'pip', 'install',
+    ]
     if ebcli_source:
-        install_args = ['pip', 'install', '{}'.format(ebcli_source.strip())]
+        install_args = pip_args + ['{}'.format(ebcli_source.strip())]
     elif version:
-        install_args = ['pip', 'install', 'awsebcli=={}'.format(version.strip())]
+        install_args = pip_args + ['awsebcli=={}'.format(version.strip())]
     else:
-        install_args = [
-            'pip', 'install', 'awsebcli',
+        install_args = pip_args + [
+            'awsebcli',
             '--upgrade',
             '--upgrade-strategy', 'eager',
         ]
-    returncode = _exec_cmd(install_args, quiet)
+    install_args.extend(
+        [
+            '--cache-dir',
+            '"{}"'.format(
+                os.path.join(
+                    os.path.abspath(virtualenv_location),
+                    VIRTUALENV_DIR_NAME,
+                    PIP_CACHE_DIR_NAME
+                )
+            )
+        ]
+    )
+    returncode, index_url = _exec_pip_install(install_args, index_mirrors, quiet)
 
     if returncode != 0:
-        exit(returncode)
+        raise InstallationError(
+            'Installation of the EBCLI failed with exit code {}.'.format(returncode),
+            returncode
+        )
+
+    return index_url
+
+
+def _active_environment_names(virtualenv_location):
+    """
+    Function returns the names of the versioned virtualenvs the `eb` wrappers
+    would select when invoked in this context: the one in the `EBCLI_VERSION`
+    environment variable, the one in the nearest ".ebcli-version" file, and
+    the default one.
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :return: a set of versioned virtualenv names
+    """
+    version_files = [
+        os.path.join(
+            os.path.abspath(virtualenv_location),
+            VIRTUALENV_DIR_NAME,
+            DEFAULT_ENVIRONMENT_POINTER
+        )
+    ]
+    directory = os.getcwd()
+    while True:
+        version_file = os.path.join(directory, PROJECT_VERSION_FILE)
+        if os.path.isfile(version_file):
+            version_files.append(version_file)
+            break
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+
+    environment_names = set([os.environ.get(VERSION_ENVIRONMENT_VARIABLE, '').strip()])
+    for version_file in version_files:
+        if os.path.isfile(version_file):
+            with open(version_file) as file:
+                environment_names.add(file.readline().strip())
+    environment_names.discard('')
+
+    return environment_names
 
 
 def _add_ebcli_stamp(virtualenv_directory):
@@ -580,18 +2154,56 @@ def _add_ebcli_stamp(virtualenv_directory):
         file.write('\n')
 
 
-def _bat_script_body(virtualenv_location):
+def _bat_script_body(virtualenv_location, shared_location=None, index_url=None):
     """
     Function returns a CMD Prompt (bat) script which essentially will
     wrap the `eb` executable such that the executable is invoked within
-    the virtualenv, ".ebcli-virtual-env", created apriori.
+    the versioned virtualenv inside ".ebcli-virtual-env" selected at the
+    time of invocation.
     :param virtualenv_location: the relative or absolute path to the location
                           where the virtualenv, ".ebcli-virtual-env", was
                           created.
+    :param shared_location: the relative or absolute path to the location of
+                            a shared installation to invoke the EBCLI from
+    :param index_url: the URL of the package index to check for new versions
+                      of the EBCLI
     :return: None
     """
     return EXECUTABLE_WRAPPERS['bat'].format(
-        bin_location=_original_eb_location(virtualenv_location)
+        **_wrapper_template_arguments(virtualenv_location, shared_location, index_url)
+    )
+
+
+def _completion_script_body(shell, ebcli_version, command_tree):
+    """
+    Function returns a static completion script for `shell`.
+    :param shell: one of the keys of `COMPLETION_SCRIPTS`
+    :param ebcli_version: the version of the awsebcli that `command_tree`
+                          belongs to
+    :param command_tree: a dict mapping each command path, such as
+                         "platform list", to the subcommands and options
+                         that may follow it, as printed by
+                         `COMMAND_TREE_WALKER`
+    :return: the completion script
+    """
+    return COMPLETION_SCRIPTS[shell].format(
+        version_marker=COMPLETION_VERSION_MARKER,
+        ebcli_version=ebcli_version,
+        command_paths='|'.join(
+            '"{}"'.format(command_path)
+            for command_path in sorted(command_tree)
+            if command_path
+        ),
+        cases='\n'.join(
+            COMPLETION_SCRIPT_CASES[shell].format(
+                command_path=command_path,
+                candidates=' '.join(
+                    command_tree[command_path]['subcommands']
+                    + command_tree[command_path]['options']
+                )
+            )
+            for command_path in sorted(command_tree)
+        )
     )
 
 
@@ -631,6 +2243,113 @@ def _eb_wrapper_location(virtualenv_location):
     )
 
 
+def _ensure_directory_is_absent_or_created_by_installer(virtualenv_directory):
+    """
+    Function halts installation when `virtualenv_directory` exists but was not
+    created by this script, asking the user to either delete the directory or
+    to specify an alternate location using the `--location` argument.
+
+    :param virtualenv_directory: The directory where the EBCLI and its
+                                 artifacts will be installed.
+    :return: None
+    :raises InstallationError: if `virtualenv_directory` was not created by
+                               this script.
+    """
+    if (
+        os.path.exists(virtualenv_directory)
+        and not _directory_was_created_by_installer(virtualenv_directory)
+    ):
+        _error(
+            'Installation cannot proceed because "{virtualenv_location}" already exists '
+                'but was not created by this EBCLI installer.'
+            '\n'
+            '\n'
+            'You can either:\n'
+            '\n'
+            '1. Delete "{virtualenv_location}" after verifying you don\'t need it; OR\n'
+            '2. Specify an alternate location to install the EBCLI and its artifacts in '
+                'using the `--location` argument of this script .\n'.format(
+                virtualenv_location=virtualenv_directory
+            )
+        )
+
+
+def _environment_directory(virtualenv_location, environment_name):
+    """
+    Function returns the location of the virtualenv of the EBCLI version,
+    `environment_name`, within ".ebcli-virtual-env".
+    :param virtualenv_location: the relative or absolute path to the location
+                          where the virtualenv, ".ebcli-virtual-env", was
+                          created.
+    :param environment_name: the name of the versioned virtualenv
+    :return: the location of the versioned virtualenv
+    """
+    return os.path.join(
+        os.path.abspath(virtualenv_location),
+        VIRTUALENV_DIR_NAME,
+        ENVIRONMENTS_DIR_NAME,
+        environment_name
+    )
+
+
+def _environment_is_installed(virtualenv_location, environment_name, zipapp=False):
+    """
+    Function checks whether the EBCLI version, `environment_name`, has
+    already been installed successfully by this script, in which case it
+    need not be installed again.
+
+    The "latest" and "source" virtualenvs are never considered installed
+    because what they represent changes over time.
+    :param virtualenv_location: the relative or absolute path to the location
+                          where the virtualenv, ".ebcli-virtual-env", was
+                          created.
+    :param environment_name: the name of the versioned virtualenv
+    :param zipapp: whether to check for a zipapp of the EBCLI version instead
+    :return: True/False
+    """
+    if environment_name in (LATEST_ENVIRONMENT_NAME, SOURCE_ENVIRONMENT_NAME):
+        return False
+
+    if zipapp:
+        return os.path.isfile(
+            _environment_directory(virtualenv_location, environment_name) + ZIPAPP_SUFFIX
+        )
+
+    if sys.platform.startswith('win32'):
+        eb_executable = 'eb.exe'
+    else:
+        eb_executable = 'eb'
+
+    return (
+        _directory_was_created_by_installer(
+            _environment_directory(virtualenv_location, environment_name)
+        )
+        and os.path.exists(
+            os.path.join(
+                _original_eb_location(virtualenv_location, environment_name),
+                eb_executable
+            )
+        )
+    )
+
+
+def _environment_name(version, ebcli_source):
+    """
+    Function returns the name of the virtualenv within ".ebcli-virtual-env"
+    to install the EBCLI in. This is the version of the EBCLI when one is
+    specified, "source" when installing from `ebcli_source`, and "latest"
+    otherwise.
+    :param version: the specific version of awsebcli to install
+    :param ebcli_source: filesystem path to the source of the EBCLI to install
+    :return: the name of the versioned virtualenv
+    """
+    if ebcli_source:
+        return SOURCE_ENVIRONMENT_NAME
+    if version:
+        return version.strip()
+    return LATEST_ENVIRONMENT_NAME
+
+
 def _ensure_not_inside_virtualenv_to_begin_with():
     """
     Function checks whether the `VIRTUAL_ENV` environment variable has
@@ -648,16 +2367,31 @@ def _ensure_not_inside_virtualenv_to_begin_with():
            of the virtualenv thereby leading to unpredictable behaviour.
 
     :return: None
-    :side-effect: script will exit with a non-0 return code if a
-                  virtualenv has already been activated within the shell.
+    :raises InstallationError: if a virtualenv has already been activated
+                               within the shell.
     """
     if os.environ.get('VIRTUAL_ENV'):
         _error('This script cannot be executed inside a virtual environment.')
 
 
 def _error(message):
-    _print_error_message('ERROR: {}'.format(message))
-    exit(1)
+    raise InstallationError(message)
+
+
+def _format_size(size):
+    """
+    Function returns a human-readable representation of `size` bytes.
+    :param size: a number of bytes
+    :return: a string such as "1.5G"
+    """
+    for unit in ['B', 'K', 'M', 'G']:
+        if size < 1024:
+            break
+        size /= 1024.0
+    else:
+        unit = 'T'
+
+    return '{0:.1f}{1}'.format(size, unit) if unit != 'B' else '{0}B'.format(size)
 
 
 def _exec_cmd(args, quiet):
@@ -683,6 +2417,44 @@ def _exec_cmd(args, quiet):
     return p.returncode
 
 
+def _exec_pip_install(install_args, index_mirrors, quiet):
+    """
+    Function executes the `pip install` command, `install_args`, against the
+    first of `index_mirrors`, failing over to the next mirror whenever
+    installation fails. pip is not allowed to retry requests to a mirror
+    while there are mirrors left to fail over to. Without `index_mirrors`,
+    the command is executed once against the index pip is configured with.
+    :param install_args: the `pip install` command to execute
+    :param index_mirrors: a list of `IndexMirror`s ordered by preference
+    :param quiet: whether to display the output of pip
+    :return: a tuple of the return code of the last attempt and the URL of
+             the mirror it was made against, if any
+    """
+    if not index_mirrors:
+        return _exec_cmd(install_args, quiet), None
+
+    for position, mirror in enumerate(index_mirrors):
+        fallback_mirrors = index_mirrors[position + 1:]
+        mirror_args = install_args + ['--index-url', '"{}"'.format(mirror.url)]
+        if fallback_mirrors:
+            mirror_args += ['--retries', '0']
+        returncode = _exec_cmd(mirror_args, quiet)
+        if returncode == 0:
+            _print_success_message('Installed from {}.'.format(mirror.url))
+            break
+
+        if fallback_mirrors:
+            _print_error_message(
+                'Installation from {0} failed with exit code {1}. Failing over to {2}.'.format(
+                    mirror.url,
+                    returncode,
+                    fallback_mirrors[0].url
+                )
+            )
+
+    return returncode, mirror.url
+
+
 def _executable_found(executable, quiet):
     """
     Function attempts to locate `executable` and returns True
@@ -693,6 +2465,124 @@ def _executable_found(executable, quiet):
     return _exec_cmd([executable, '--version'], quiet) == 0
 
 
+def _wrapper_interpreters(virtualenv_location):
+    """
+    Function returns the paths through which the Python installation the `eb`
+    wrapper is run with may be reached: the interpreter named in the shebang
+    of the wrapper, and the `python` found on the PATH, which the wrapper runs
+    with when its shebang is "/usr/bin/env python", or which the Windows
+    wrappers invoke. Both the path of an interpreter and the one its symbolic
+    links resolve to are returned, since the interpreter of a virtualenv is a
+    link into the Python installation it was created with.
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :return: a list of absolute paths
+    """
+    interpreters = [_find_executable('python')]
+    try:
+        with open(os.path.join(_eb_wrapper_location(virtualenv_location), 'eb')) as wrapper:
+            shebang = wrapper.readline()
+    except (IOError, OSError, UnicodeDecodeError):
+        shebang = ''
+    if shebang.startswith('#!') and not shebang[2:].startswith('/usr/bin/env'):
+        interpreters.append(shebang[2:].strip())
+
+    paths = []
+    for interpreter in interpreters:
+        if interpreter and os.path.isabs(interpreter):
+            paths.extend([
+                os.path.dirname(os.path.dirname(interpreter)),
+                os.path.realpath(interpreter)
+            ])
+
+    return paths
+
+
+def _find_executable(executable):
+    """
+    Function returns the path of `executable` as resolved through PATH.
+    :param executable: the name of an executable
+    :return: the path of `executable`, or None if it isn't in PATH
+    """
+    try:
+        from shutil import which
+    except ImportError:
+        from distutils.spawn import find_executable as which
+
+    return which(executable)
+
+
+def _installed_ebcli_version(virtualenv_location, environment_name):
+    """
+    Function returns the version of the awsebcli installed in the versioned
+    virtualenv, `environment_name`, as recorded by the name of its package
+    metadata directory.
+    :param virtualenv_location: the relative or absolute path to the location
+                                where the virtualenv, ".ebcli-virtual-env",
+                                was created.
+    :param environment_name: the name of the versioned virtualenv
+    :return: the version of the awsebcli, or None if it cannot be determined
+    """
+    environment_directory = _environment_directory(virtualenv_location, environment_name)
+    for metadata_directory in glob.glob(
+        os.path.join(environment_directory, 'lib', 'python*', 'site-packages', 'awsebcli-*-info')
+    ) + glob.glob(
+        os.path.join(environment_directory, 'Lib', 'site-packages', 'awsebcli-*-info')
+    ):
+        version = os.path.basename(metadata_directory)[len('awsebcli-'):].split('-')[0]
+        if version.endswith('.dist'):
+            version = version[:-len('.dist')]
+        return version
+
+
+def _installer_version():
+    """
+    Function returns the version of this installer recorded in the "VERSION"
+    file at the root of this project. The file is read when the version is
+    needed rather than when this script is imported, and may be missing, as
+    when this script is copied elsewhere on its own.
+    :return: the version of this installer, or "unknown"
+    """
+    try:
+        with open(os.path.join(PROJECT_ROOT, 'VERSION')) as version_file:
+            return version_file.read().strip()
+    except (IOError, OSError):
+        return 'unknown'
+
+
+def _is_zip_safe(path):
+    """
+    Function checks whether the top-level module or package at `path`
+    consists of Python modules alone, and may hence be imported from within
+    a zip file.
+    :param path: the path to a module or package
+    :return: True/False
+    """
+    if not os.path.isdir(path):
+        return path.endswith(ZIP_SAFE_FILE_EXTENSIONS)
+
+    return all(
+        file_name.endswith(ZIP_SAFE_FILE_EXTENSIONS)
+        for directory, _, file_names in os.walk(path)
+        if os.path.basename(directory) != '__pycache__'
+        for file_name in file_names
+    )
+
+
+def _list_directory(directory):
+    """
+    Function returns the sorted names of the entries of `directory`, or an
+    empty list if `directory` does not exist.
+    :param directory: the directory to list
+    :return: a list of entry names
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    return sorted(os.listdir(directory))
+
+
 def _user_local_directory():
     """
     Function attempts to find the home of the current user. On Unix/Linux,
@@ -718,14 +2608,16 @@ def _user_local_directory():
     return identified_location
 
 
-def _original_eb_location(virtualenv_location):
+def _original_eb_location(virtualenv_location, environment_name):
     """
-    Function returns the location of the directory within the virtualenv,
-    ".ebcli-virtual-env", where the original `eb` executable is expected
-    to be found. This is `bin` on Unix/Linux and `Scripts` on Windows.
+    Function returns the location of the directory within the versioned
+    virtualenv, `environment_name`, inside ".ebcli-virtual-env", where the
+    original `eb` executable is expected to be found. This is `bin` on
+    Unix/Linux and `Scripts` on Windows.
     :param virtualenv_location: the relative or absolute path to the location
                           where the virtualenv, ".ebcli-virtual-env", was
                           created.
+    :param environment_name: the name of the versioned virtualenv
     :return: the location of the directory within the virtualenv where
              the original `eb` executable is expected to be found
     """
@@ -735,24 +2627,22 @@ def _original_eb_location(virtualenv_location):
         scripts_directory = 'bin'
 
     return os.path.join(
-        os.path.abspath(virtualenv_location),
-        VIRTUALENV_DIR_NAME,
+        _environment_directory(virtualenv_location, environment_name),
         scripts_directory
     )
 
 
-def _parse_arguments():
+def _argument_parser():
     """
-    Function creates an `ArgumentParser`, parses arguments, and returns
-    the parsed arguments.
+    Function creates the `ArgumentParser` of the command-line arguments,
+    whose defaults are also those of the options of `EBCLIInstaller`.
 
-    :return: an instance of argparse.Namespace representing the command-line
-             arguments passed by the user.
+    :return: an instance of argparse.ArgumentParser
     """
     parser = argparse.ArgumentParser(
         description='EBCLI installer {}\n\n'
                     'This program creates an isolated virtualenv solely meant for invoking '
-                    '`eb` within.'.format(EBCLI_INSTALLER_VERSION),
+                    '`eb` within.'.format(_installer_version()),
         usage='python {file_name} [optional arguments]'.format(file_name=__file__),
         formatter_class=argparse.RawTextHelpFormatter
     )
@@ -760,15 +2650,63 @@ def _parse_arguments():
         '-e', '--virtualenv-executable',
         help="path to the virtualenv installation to use to create the EBCLI's virtualenv"
     )
+    parser.add_argument(
+        '-b', '--size-budget',
+        default=DEFAULT_SIZE_BUDGET,
+        type=_parse_size,
+        help='number of bytes, optionally followed by K, M, G, or T, that the artifacts \n'
+             'of the installers may occupy after "--gc"; defaults to {}'.format(DEFAULT_SIZE_BUDGET)
+    )
+    parser.add_argument(
+        '-d', '--dry-run',
+        action='store_true',
+        help='only report what "--gc" would evict'
+    )
+    parser.add_argument(
+        '-z', '--zipapp',
+        action='store_true',
+        help='build a single executable .pyz file containing the awsebcli and its dependencies \n'
+             'for "--python-installation", instead of creating a virtualenv; not supported on \n'
+             'Windows'
+    )
+    parser.add_argument(
+        '-g', '--gc',
+        action='store_true',
+        help='instead of installing the EBCLI, evict the least recently used EBCLI versions, \n'
+             'caches, and Python installations created by the installers until they fit in \n'
+             '"--size-budget". The active EBCLI version is never evicted.'
+    )
+    parser.add_argument(
+        '-G', '--gc-shared',
+        action='store_true',
+        help='with "--gc", also evict EBCLI versions of a shared installation created using \n'
+             '"--system", which are otherwise kept because the versions its users select, and \n'
+             'when they last used them, are recorded in their own directories'
+    )
     parser.add_argument(
         '-i', '--hide-export-recommendation',
         action='store_true',
         help="boolean to hide recommendation to modify PATH"
     )
+    parser.add_argument(
+        '-m', '--index-mirror',
+        action='append',
+        dest='index_mirrors',
+        metavar='INDEX_URL',
+        help='URL of a package index to install from; when passed several times, the indexes \n'
+             'are probed concurrently and the fastest healthy one is installed from, failing \n'
+             'over to the others, fastest first, if installation fails'
+    )
     parser.add_argument(
         '-l', '--location',
         help='location to store the awsebcli packages and its dependencies in'
     )
+    parser.add_argument(
+        '-o', '--overlay',
+        action='store_true',
+        help='with "--shared-installation", create a per-user directory that the `eb` wrappers \n'
+             'prepend to PYTHONPATH, for packages installed using `pip install --target`'
+    )
     parser.add_argument(
         '-p', '--python-installation',
         help='path to the python installation under which to install the '
@@ -784,19 +2722,108 @@ def _parse_arguments():
         help='filesystem path to a Git repository of the EBCLI, or a .zip or .tar file of \n'
              'the EBCLI source code; useful when testing a development version of the EBCLI.'
     )
+    parser.add_argument(
+        '-S', '--system',
+        action='store_true',
+        help='build a precompiled installation shared by all users, which is read-only to \n'
+             'users other than its owner, at "--location", or at {} by default'.format(SYSTEM_LOCATION)
+    )
+    parser.add_argument(
+        '-u', '--shared-installation',
+        help='location of an installation created using "--system"; instead of installing \n'
+             'the EBCLI, only create `eb` wrappers that invoke the EBCLI from it. \n'
+             '"--version" selects one of its versions as the default for this user.'
+    )
     parser.add_argument(
         '-v', '--version',
-        help='version of EBCLI to install'
+        help='version of EBCLI to install alongside any other installed versions; \n'
+             'versions that are already installed are only made the default'
     )
 
-    arguments = parser.parse_args()
+    return parser
+
+
+def _parse_arguments():
+    """
+    Function parses the command-line arguments and returns them.
+
+    :return: an instance of argparse.Namespace representing the command-line
+             arguments passed by the user.
+    """
+    return _argument_parser().parse_args()
 
+
+def _validate_arguments(arguments):
+    """
+    Function checks that `arguments` do not combine options that cannot be
+    used together.
+
+    :param arguments: an instance of argparse.Namespace representing the
+                      command-line arguments, or the options of an
+                      `EBCLIInstaller`
+    :return: None
+    :raises ArgumentError: if incompatible options are combined
+    """
     if arguments.version and arguments.ebcli_source:
         raise ArgumentError(
             '"--version" and "--ebcli-source" cannot be used together '
             'because they represent two distinct sources of the EBCLI.'
         )
-    return arguments
+    if arguments.system and arguments.shared_installation:
+        raise ArgumentError(
+            '"--system" and "--shared-installation" cannot be used together '
+            'because the former creates the installation the latter uses.'
+        )
+    if arguments.zipapp and sys.platform.startswith('win32'):
+        raise ArgumentError(
+            '"--zipapp" is not supported on Windows, where the `eb` wrappers only '
+            'invoke versioned virtualenvs.'
+        )
+    if arguments.zipapp and (arguments.system or arguments.shared_installation):
+        raise ArgumentError(
+            '"--zipapp" cannot be used together with "--system" or "--shared-installation".'
+        )
+    if arguments.shared_installation and arguments.index_mirrors:
+        raise ArgumentError(
+            '"--shared-installation" and "--index-mirror" cannot be used together '
+            'because the EBCLI is not installed when using a shared installation.'
+        )
+    if arguments.shared_installation and arguments.ebcli_source:
+        raise ArgumentError(
+            '"--shared-installation" and "--ebcli-source" cannot be used together '
+            'because the EBCLI is not installed when using a shared installation.'
+        )
+
+
+def _parse_size(size):
+    """
+    Function parses a size such as "500M", "2G", or "1048576" into a number
+    of bytes. It is meant to be used as the `type` of an argparse argument.
+    :param size: a number of bytes, optionally followed by one of the
+                 (binary) units K, M, G, and T
+    :return: the number of bytes
+    """
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$', size, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(
+            '"{}" is not a size such as "500M" or "2G"'.format(size)
+        )
+    number, unit = match.groups()
+
+    return int(float(number) * 1024 ** ' KMGT'.index(unit.upper() or ' '))
+
+
+def _path_is_within(path, directory):
+    """
+    Function checks whether `path` is `directory` or lies within it.
+    :param path: a relative or absolute path
+    :param directory: a relative or absolute path to a directory
+    :return: True/False
+    """
+    path = os.path.realpath(path)
+    directory = os.path.realpath(directory)
+
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
 
 
 def _pip_executable_found(quiet):
@@ -822,57 +2849,344 @@ def _pip_executable_found(quiet):
             return True
 
 
-def _powershell_script_body(virtualenv_location):
+def _powershell_script_body(virtualenv_location, shared_location=None, index_url=None):
     """
     Function returns a Powershell (PS1) script which essentially will
     wrap the `eb` executable such that the executable is invoked within
-    the virtualenv, ".ebcli-virtual-env", created apriori.
+    the versioned virtualenv inside ".ebcli-virtual-env" selected at the
+    time of invocation.
     :param virtualenv_location: the relative or absolute path to the location
                           where the virtualenv, ".ebcli-virtual-env", was
                           created.
+    :param shared_location: the relative or absolute path to the location of
+                            a shared installation to invoke the EBCLI from
+    :param index_url: the URL of the package index to check for new versions
+                      of the EBCLI
     :return: None
     """
     return EXECUTABLE_WRAPPERS['ps1'].format(
-        bin_location=_original_eb_location(virtualenv_location)
+        **_wrapper_template_arguments(virtualenv_location, shared_location, index_url)
+    )
+
+
+def _print_garbage_collection_report(
+        artifacts,
+        evicted,
+        total_size,
+        size_budget,
+        dry_run
+):
+    """
+    Function prints what happened to each of `artifacts` in the course of
+    garbage collection, least recently used first, followed by the combined
+    size of the artifacts left behind.
+    :param artifacts: a list of all of the `Artifact`s taken inventory of
+    :param evicted: a list of the `Artifact`s (to be) evicted
+    :param total_size: the combined size of the `Artifact`s left behind
+    :param size_budget: the number of bytes the artifacts may occupy
+    :param dry_run: whether the artifacts were only reported and not evicted
+    :return: None
+    """
+    for artifact in sorted(artifacts, key=lambda artifact: artifact.last_used):
+        if artifact in evicted:
+            action = 'would evict' if dry_run else 'evicted'
+        elif artifact.protected_reason:
+            action = 'kept ({})'.format(artifact.protected_reason)
+        elif _python_is_in_use(artifact, artifacts, evicted):
+            action = 'kept (in use)'
+        else:
+            action = 'kept'
+        print(
+            '{action:<30} {size:>8}  {last_used}  {description}: {paths}'.format(
+                action=action,
+                size=_format_size(artifact.size),
+                last_used=time.strftime('%Y-%m-%d %H:%M', time.localtime(artifact.last_used)),
+                description=artifact.description,
+                paths=', '.join(artifact.paths),
+            )
+        )
+
+    summary = '{total_size} of artifacts {verb} left within a budget of {size_budget}.'.format(
+        total_size=_format_size(total_size),
+        verb='would be' if dry_run else 'are',
+        size_budget=_format_size(size_budget),
     )
+    if total_size > size_budget:
+        _print_recommendation_message(
+            summary + ' The rest of the artifacts are protected or in use.'
+        )
+    else:
+        _print_success_message(summary)
+
 
+def _probe_index_mirror(mirror, version):
+    """
+    Function fetches the simple (PEP 503) project page of the awsebcli from
+    the package index `mirror` and records on `mirror` the time it took or
+    the reason the mirror is unhealthy.
+    :param mirror: an `IndexMirror`
+    :param version: the specific version of awsebcli the page must list, if any
+    :return: None
+    """
+    try:
+        from urllib.request import urlopen
+    except ImportError:
+        from urllib2 import urlopen
+
+    start = time.time()
+    try:
+        response = urlopen(mirror.url + '/awsebcli/', timeout=INDEX_MIRROR_PROBE_TIMEOUT_SECONDS)
+        try:
+            page = response.read().decode('utf-8', 'replace')
+        finally:
+            response.close()
+    except Exception as exception:
+        mirror.error = str(exception)
+        return
+
+    if version:
+        listed = re.search(
+            r'awsebcli-{}(?:\.tar\.gz|\.zip|-py)'.format(re.escape(version)),
+            page
+        )
+    else:
+        listed = 'awsebcli-' in page
+    if not listed:
+        mirror.error = 'awsebcli {}is not listed'.format(version + ' ' if version else '')
+        return
+
+    mirror.latency = time.time() - start
 
-def _python_script_body(virtualenv_location):
+
+def _python_is_in_use(artifact, artifacts, evicted):
+    """
+    Function checks whether `artifact` is a Python installation that one
+    of `artifacts`, which is not among `evicted`, was created with.
+    :param artifact: the `Artifact` to check
+    :param artifacts: a list of all of the `Artifact`s taken inventory of
+    :param evicted: a list of the `Artifact`s (to be) evicted
+    :return: True/False
+    """
+    if not artifact.provides_python:
+        return False
+
+    return any(
+        other.python_home
+        and other not in evicted
+        and other is not artifact
+        and _path_is_within(other.python_home, artifact.provides_python)
+        for other in artifacts
+    )
+
+
+def _python_script_body(
+        virtualenv_location,
+        shared_location=None,
+        index_url=None,
+        python_installation=None
+):
     """
     Function returns a Python script which essentially will wrap
     the `eb` executable such that the executable is invoked within
-    the virtualenv, ".ebcli-virtual-env", created apriori.
+    the versioned virtualenv inside ".ebcli-virtual-env" selected at the
+    time of invocation.
     :param virtualenv_location: the relative or absolute path to the location
                           where the virtualenv, ".ebcli-virtual-env", was
                           created.
+    :param shared_location: the relative or absolute path to the location of
+                            a shared installation to invoke the EBCLI from
+    :param index_url: the URL of the package index to check for new versions
+                      of the EBCLI
+    :param python_installation: the Python to execute the script with; see
+                                `_wrapper_interpreter`
     :return: None
     """
     return EXECUTABLE_WRAPPERS['py'].format(
-        bin_location=_original_eb_location(virtualenv_location)
+        **_wrapper_template_arguments(
+            virtualenv_location,
+            shared_location,
+            index_url,
+            python_installation
+        )
     )
 
 
-if __name__ == '__main__':
-    _ensure_not_inside_virtualenv_to_begin_with()
-    arguments_context = _parse_arguments()
-    virtualenv = (
-        arguments_context.virtualenv_executable
-        or _locate_virtualenv_executable()
-    )
-    virtualenv_location = _create_virtualenv(
-        virtualenv,
-        arguments_context.location,
-        arguments_context.python_installation,
-        arguments_context.quiet
-    )
-    _activate_virtualenv(virtualenv_location)
-    _install_ebcli(
-        arguments_context.quiet,
-        arguments_context.version,
-        arguments_context.ebcli_source
-    )
-    _generate_ebcli_wrappers(virtualenv_location)
-    _announce_success(
+def _resolve_python_installation(python_installation):
+    """
+    Function returns the absolute path of `python_installation`, if passed,
+    or else of the Python executing this script. A name without a directory,
+    such as "python3", is looked up in PATH rather than in the current
+    working directory.
+    :param python_installation: the relative or absolute path to, or the
+                                name in PATH of, a Python executable, or None
+    :return: the absolute path of the Python executable, or None if a name
+             cannot be found in PATH
+    """
+    interpreter = python_installation or sys.executable
+    if interpreter and os.sep not in interpreter:
+        interpreter = _find_executable(interpreter)
+    if interpreter:
+        return os.path.abspath(interpreter)
+
+
+@Step('Selecting default EBCLI version')
+def _select_default_environment(virtualenv_location, environment_name):
+    """
+    Function points the `eb` wrappers at the EBCLI version, `environment_name`,
+    by default. The wrappers will only fall back to this pointer when neither
+    the `EBCLI_VERSION` environment variable nor a ".ebcli-version" file
+    selects a version.
+    :param virtualenv_location: the relative or absolute path to the location
+                          where the virtualenv, ".ebcli-virtual-env", was
+                          created.
+    :param environment_name: the name of the versioned virtualenv
+    :return: None
+    """
+    with open(
+        os.path.join(
+            os.path.abspath(virtualenv_location),
+            VIRTUALENV_DIR_NAME,
+            DEFAULT_ENVIRONMENT_POINTER
+        ),
+        'w'
+    ) as file:
+        file.write(environment_name + '\n')
+
+
+def _scan_paths(paths):
+    """
+    Function walks `paths`, without following symbolic links, and returns
+    their combined size along with the time any of the files within them was
+    last accessed or modified.
+
+    Versioned virtualenvs carry, and zipapps are accompanied by, a
+    `LAST_USED_MARKER` refreshed by the `eb` wrapper, which is used instead
+    of their files' times when present.
+    :param paths: a list of paths to files or directories
+    :return: a tuple of the size in bytes and the time since the epoch
+    """
+    size = 0
+    last_used = 0
+    for path in paths:
+        if os.path.isdir(path):
+            marker = os.path.join(path, LAST_USED_MARKER)
+        else:
+            marker = path + LAST_USED_MARKER
+        use_file_times = not os.path.exists(marker)
+        if not use_file_times:
+            last_used = max(last_used, os.path.getmtime(marker))
+
+        if os.path.isdir(path) and not os.path.islink(path):
+            file_paths = (
+                os.path.join(directory, file_name)
+                for directory, _, file_names in os.walk(path)
+                for file_name in file_names
+            )
+        else:
+            file_paths = [path]
+
+        for file_path in file_paths:
+            try:
+                status = os.lstat(file_path)
+            except OSError:
+                continue
+            size += status.st_size
+            if use_file_times:
+                last_used = max(last_used, status.st_atime, status.st_mtime)
+
+    return size, last_used
+
+
+def _virtualenv_python_home(virtualenv_directory):
+    """
+    Function returns the directory of the Python installation that the
+    virtualenv at `virtualenv_directory` was created with, as recorded
+    in its "pyvenv.cfg".
+    :param virtualenv_directory: the directory of a virtualenv
+    :return: the directory of a Python installation, or None if it cannot be
+             determined
+    """
+    pyvenv_cfg = os.path.join(virtualenv_directory, 'pyvenv.cfg')
+    if not os.path.isfile(pyvenv_cfg):
+        return None
+
+    with open(pyvenv_cfg) as file:
+        for line in file:
+            key, _, value = line.partition('=')
+            if key.strip() == 'home':
+                return value.strip()
+
+
+def _wrapper_interpreter(python_installation):
+    """
+    Function returns the interpreter directive of the Unix/Linux `eb` wrapper:
+    the absolute path of `python_installation`, which the versioned
+    virtualenvs are created with, if passed, or else of the Python executing
+    this script. `python` therefore need not be in PATH; many computers only
+    have `python3`. Paths containing whitespace cannot be used in interpreter
+    directives, in which case the wrapper falls back to `python` in PATH.
+    :param python_installation: the relative or absolute path to, or the
+                                name in PATH of, a Python executable, or None
+    :return: the path of the interpreter, or "/usr/bin/env python"
+    """
+    interpreter = _resolve_python_installation(python_installation)
+    if not interpreter or re.search(r'\s', interpreter):
+        return '/usr/bin/env python'
+
+    return interpreter
+
+
+def _wrapper_template_arguments(
         virtualenv_location,
-        arguments_context.hide_export_recommendation
-    )
\ No newline at end of file
+        shared_location=None,
+        index_url=None,
+        python_installation=None
+):
+    """
+    Function returns the arguments to format the templates in
+    `EXECUTABLE_WRAPPERS` with.
+    :param virtualenv_location: the relative or absolute path to the location
+                          where the virtualenv, ".ebcli-virtual-env", was
+                          created.
+    :param shared_location: the relative or absolute path to the location of
+                            a shared installation to invoke the EBCLI from
+    :param index_url: the URL of the package index to check for new versions
+                      of the EBCLI; defaults to that pip is configured with
+    :param python_installation: the Python to execute the Unix/Linux wrapper
+                                with; see `_wrapper_interpreter`
+    :return: a dict of template arguments
+    """
+    return dict(
+        interpreter=_wrapper_interpreter(python_installation),
+        root=os.path.join(
+            os.path.abspath(virtualenv_location),
+            VIRTUALENV_DIR_NAME
+        ),
+        environments_root=os.path.join(
+            os.path.abspath(shared_location or virtualenv_location),
+            VIRTUALENV_DIR_NAME
+        ),
+        overlay_directory=OVERLAY_DIR_NAME,
+        zipapp_suffix=ZIPAPP_SUFFIX,
+        default_pointer=DEFAULT_ENVIRONMENT_POINTER,
+        environments_directory=ENVIRONMENTS_DIR_NAME,
+        last_used_marker=LAST_USED_MARKER,
+        index_url=index_url or os.environ.get('PIP_INDEX_URL') or DEFAULT_INDEX_URL,
+        project_version_file=PROJECT_VERSION_FILE,
+        update_check_cache=UPDATE_CHECK_CACHE,
+        update_check_child=UPDATE_CHECK_CHILD_ENVIRONMENT_VARIABLE,
+        update_check_index_variable=UPDATE_CHECK_INDEX_ENVIRONMENT_VARIABLE,
+        update_check_opt_out=UPDATE_CHECK_OPT_OUT_ENVIRONMENT_VARIABLE,
+        update_check_ttl=UPDATE_CHECK_TTL_SECONDS,
+        update_check_ttl_variable=UPDATE_CHECK_TTL_ENVIRONMENT_VARIABLE,
+        version_variable=VERSION_ENVIRONMENT_VARIABLE,
+    )
+
+
+if __name__ == '__main__':
+    try:
+        _ensure_not_inside_virtualenv_to_begin_with()
+        EBCLIInstaller(**vars(_parse_arguments())).run()
+    except InstallationError as exception:
+        _print_error_message('ERROR: {}'.format(exception))
+        exit(exception.returncode)
@@ -0,0 +1,435 @@
+"""
+This script checks how `ebcli_installer.py` probes, selects, and fails over
+between package index mirrors passed through `--index-mirror`. It starts
+local stand-ins for the mirrors, which proxy https://pypi.org/simple, and
+the distributions it links to, while injecting faults, installs the EBCLI
+through them, and exits with a non-0 return code if the installer doesn't
+report the expected outcome:
+
+    1. probing: of a fast mirror, a slow one, one that refuses connections,
+       one that responds with 503, one that responds after the probe timed
+       out, and one whose listing is stale, only the fast and the slow ones
+       are deemed healthy, and the fast one is installed from
+    2. mid-install failover: a mirror that serves the probe but responds with
+       503 from then on is selected, and installation fails over from it to
+       the next fastest mirror
+    3. download failover: a mirror that serves its pages but responds with
+       503 to downloads of distributions is selected, and installation fails
+       over from it, once it attempted a download, to the next fastest mirror
+
+Prerequisites:
+
+    Those of `ebcli_installer.py`, Python 3 to run this script, and access to
+    https://pypi.org and https://files.pythonhosted.org.
+
+Usage:
+
+    To execute script:
+
+        python scripts/index_mirror_harness.py --version 3.14.13
+
+        # specify Python executable and virtualenv executable
+        python scripts/index_mirror_harness.py --version 3.14.13 -p /usr/bin/python3 -e /usr/local/bin/virtualenv
+
+    To view help text:
+
+        python scripts/index_mirror_harness.py --help
+
+"""
+import argparse
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.request import urlopen
+
+
+SCRIPTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+INSTALLER = os.path.join(SCRIPTS_DIRECTORY, 'ebcli_installer.py')
+
+
+UPSTREAM_INDEX_URL = 'https://pypi.org/simple'
+
+
+UPSTREAM_FILES_URL = 'https://files.pythonhosted.org'
+
+
+# Must exceed `INDEX_MIRROR_PROBE_TIMEOUT_SECONDS` of `ebcli_installer.py`
+HUNG_MIRROR_DELAY_SECONDS = 7
+
+
+SLOW_MIRROR_DELAY_SECONDS = 1
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The installer gives up on stand-ins that are slower than its probe
+        # timeout, so they find the connection closed when they respond
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            HTTPServer.handle_error(self, request, client_address)
+
+
+class IndexMirrorStandIn(object):
+    """
+    Class serves a stand-in for a package index mirror on a local port. It
+    proxies `UPSTREAM_INDEX_URL`, and the distributions on
+    `UPSTREAM_FILES_URL` it links to, rewriting the links to point to the
+    stand-in. After waiting `delay` seconds, it responds with 503 to every
+    request after the first `available_requests`, if any, and to every
+    download of a distribution if `failing_downloads` is set, and replaces
+    the project page of the awsebcli with `stale_listing`, if any.
+    """
+    def __init__(
+            self,
+            name,
+            delay=0,
+            available_requests=None,
+            stale_listing=None,
+            failing_downloads=False
+    ):
+        self.name = name
+        self.delay = delay
+        self.available_requests = available_requests
+        self.stale_listing = stale_listing
+        self.failing_downloads = failing_downloads
+        self.requests = 0
+        self.download_requests = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.root_url = 'http://127.0.0.1:{}'.format(self._server.server_address[1])
+        self.url = self.root_url + '/simple'
+
+    def start(self):
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                is_download = path.startswith('/packages/')
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    request_number = stand_in.requests
+                    if is_download:
+                        stand_in.download_requests += 1
+                time.sleep(stand_in.delay)
+
+                if stand_in.available_requests is not None \
+                        and request_number > stand_in.available_requests:
+                    self.send_error(503)
+                    return
+                if is_download and stand_in.failing_downloads:
+                    self.send_error(503)
+                    return
+
+                if stand_in.stale_listing is not None and path.rstrip('/') == '/simple/awsebcli':
+                    body = stand_in.stale_listing.encode('utf-8')
+                else:
+                    body = _fetch_upstream(path)
+                    if body is not None and not is_download:
+                        body = body.replace(
+                            UPSTREAM_FILES_URL.encode('utf-8'),
+                            stand_in.root_url.encode('utf-8')
+                        )
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class RefusingIndexMirror(object):
+    """
+    Class describes a package index mirror that refuses connections: the URL
+    points to a local port nothing listens on.
+    """
+    def __init__(self, name):
+        self.name = name
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        self.url = 'http://127.0.0.1:{}/simple'.format(probe.getsockname()[1])
+        probe.close()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+_upstream_cache = {}
+_upstream_cache_lock = threading.Lock()
+
+
+def _fetch_upstream(path):
+    """
+    Function fetches `path`, the path of a page of a stand-in, from the
+    upstream package index, or, for the distributions the pages of the
+    stand-ins link to, from the upstream file host. Responses are cached for
+    the lifetime of this script so that the delays of the stand-ins dominate
+    the time they take to respond.
+
+    :param path: the path requested from a stand-in
+    :return: the body of the upstream response, or None if it failed
+    """
+    if path.startswith('/packages/'):
+        url = UPSTREAM_FILES_URL + path
+    else:
+        url = UPSTREAM_INDEX_URL + path[len('/simple'):]
+
+    with _upstream_cache_lock:
+        if url in _upstream_cache:
+            return _upstream_cache[url]
+    try:
+        response = urlopen(url, timeout=30)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+    except Exception:
+        return None
+    with _upstream_cache_lock:
+        _upstream_cache[url] = body
+
+    return body
+
+
+def _install(location, arguments, mirrors):
+    """
+    Function installs the EBCLI at `location` using `ebcli_installer.py`
+    from `mirrors` and returns its return code and output.
+
+    :param location: the location to install the EBCLI in
+    :param arguments: the parsed command-line arguments of this script
+    :param mirrors: the stand-ins to pass through `--index-mirror`
+    :return: a tuple of the return code and the combined STDOUT and STDERR
+             of `ebcli_installer.py`
+    """
+    installer_args = [
+        sys.executable, INSTALLER,
+        '--quiet',
+        '--hide-export-recommendation',
+        '--location', location,
+        '--version', arguments.version,
+    ]
+    for mirror in mirrors:
+        installer_args += ['--index-mirror', mirror.url]
+    if arguments.python_installation:
+        installer_args += ['--python-installation', arguments.python_installation]
+    if arguments.virtualenv_executable:
+        installer_args += ['--virtualenv-executable', arguments.virtualenv_executable]
+
+    environment = dict(os.environ, EBCLI_DISABLE_UPDATE_CHECK='1', PYTHONUNBUFFERED='1')
+    environment.pop('VIRTUAL_ENV', None)
+    process = subprocess.Popen(
+        installer_args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=environment
+    )
+    output = process.communicate()[0].decode('utf-8', 'replace')
+
+    return process.returncode, output
+
+
+def _parse_arguments():
+    """
+    Function creates an `ArgumentParser`, parses arguments, and returns
+    the parsed arguments.
+
+    :return: an instance of argparse.Namespace representing the command-line
+             arguments passed by the user.
+    """
+    parser = argparse.ArgumentParser(
+        description='Checks how the EBCLI installer probes, selects, and fails over between '
+                    'package index mirrors, using local stand-ins that inject faults.'
+    )
+    parser.add_argument(
+        '-e', '--virtualenv-executable',
+        help="path to the virtualenv installation to use to create the EBCLI's virtualenv"
+    )
+    parser.add_argument(
+        '-p', '--python-installation',
+        help='path to the python installation under which to install the awsebcli'
+    )
+    parser.add_argument(
+        '-v', '--version',
+        required=True,
+        help='version of EBCLI to install; the stale stand-in lists neighbouring versions '
+             'but not this one'
+    )
+
+    return parser.parse_args()
+
+
+def _run_scenario(title, location, arguments, mirrors, expected_lines, downloaded_from):
+    """
+    Function starts `mirrors`, installs the EBCLI from them, and checks that
+    installation succeeds, that its output matches each of `expected_lines`,
+    and that distributions were requested from each of `downloaded_from`.
+
+    :param title: the title of the scenario to print
+    :param location: the location to install the EBCLI in
+    :param arguments: the parsed command-line arguments of this script
+    :param mirrors: the stand-ins to pass through `--index-mirror`
+    :param expected_lines: a list of regular expressions each of which must
+                           match a line of the output of the installer
+    :param downloaded_from: a list of the stand-ins among `mirrors` that must
+                            have been requested distributions
+    :return: True if the scenario passed, False otherwise
+    """
+    print('{}:'.format(title))
+    for mirror in mirrors:
+        mirror.start()
+    try:
+        returncode, output = _install(location, arguments, mirrors)
+    finally:
+        for mirror in mirrors:
+            mirror.stop()
+
+    failures = []
+    if returncode != 0:
+        failures.append('`ebcli_installer.py` exited with {}'.format(returncode))
+    for expected_line in expected_lines:
+        if not re.search(expected_line, output, re.MULTILINE):
+            failures.append('no line of the output matches: {}'.format(expected_line))
+    for mirror in downloaded_from:
+        if not mirror.download_requests:
+            failures.append('no distribution was requested from {}'.format(mirror.name))
+
+    for mirror in mirrors:
+        print(
+            '    {0:<12} {1:<32} {2:>4} request(s), {3:>3} download(s)'.format(
+                mirror.name,
+                mirror.url,
+                getattr(mirror, 'requests', 0),
+                getattr(mirror, 'download_requests', 0)
+            )
+        )
+    if failures:
+        for failure in failures:
+            print('    FAILED: {}'.format(failure))
+        print('    output of `ebcli_installer.py`:')
+        for line in output.splitlines():
+            print('        {}'.format(line))
+        return False
+
+    print('    passed')
+    return True
+
+
+def _url(mirror):
+    """
+    Function returns the URL of `mirror` escaped for use in a regular expression.
+    :param mirror: a stand-in
+    :return: the escaped URL
+    """
+    return re.escape(mirror.url)
+
+
+if __name__ == '__main__':
+    arguments_context = _parse_arguments()
+    version = arguments_context.version
+    scratch_directory = tempfile.mkdtemp()
+    try:
+        fast = IndexMirrorStandIn('fast')
+        slow = IndexMirrorStandIn('slow', delay=SLOW_MIRROR_DELAY_SECONDS)
+        refusing = RefusingIndexMirror('refusing')
+        unavailable = IndexMirrorStandIn('unavailable', available_requests=0)
+        hung = IndexMirrorStandIn('hung', delay=HUNG_MIRROR_DELAY_SECONDS)
+        stale = IndexMirrorStandIn(
+            'stale',
+            stale_listing=(
+                '<html><body>'
+                '<a href="#">awsebcli-3.0.0.tar.gz</a><br/>'
+                '<a href="#">awsebcli-{0}0.tar.gz</a><br/>'
+                '<a href="#">awsebcli-{0}.1.tar.gz</a><br/>'
+                '</body></html>'.format(version)
+            )
+        )
+        probing_passed = _run_scenario(
+            'probing',
+            os.path.join(scratch_directory, 'probing'),
+            arguments_context,
+            [slow, refusing, unavailable, hung, stale, fast],
+            [
+                r'^healthy +{}: \d+ ms$'.format(_url(fast)),
+                r'^healthy +{}: \d+ ms$'.format(_url(slow)),
+                r'^unhealthy +{}: .+$'.format(_url(refusing)),
+                r'^unhealthy +{}: .*503'.format(_url(unavailable)),
+                r'^unhealthy +{}: .*timed out'.format(_url(hung)),
+                r'^unhealthy +{}: awsebcli {} is not listed$'.format(_url(stale), re.escape(version)),
+                r'Selected {}: the fastest of 2 healthy mirror\(s\)'.format(_url(fast)),
+                r'Installed from {}\.'.format(_url(fast)),
+            ],
+            [fast]
+        )
+
+        flaky = IndexMirrorStandIn('flaky', available_requests=1)
+        backup = IndexMirrorStandIn('backup', delay=SLOW_MIRROR_DELAY_SECONDS)
+        failover_passed = _run_scenario(
+            'mid-install failover',
+            os.path.join(scratch_directory, 'failover'),
+            arguments_context,
+            [backup, flaky],
+            [
+                r'Selected {}: the fastest of 2 healthy mirror\(s\)'.format(_url(flaky)),
+                r'Installation from {} failed with exit code \d+\. Failing over to {}\.'.format(
+                    _url(flaky),
+                    _url(backup)
+                ),
+                r'Installed from {}\.'.format(_url(backup)),
+            ],
+            [backup]
+        )
+
+        broken = IndexMirrorStandIn('broken', failing_downloads=True)
+        backup = IndexMirrorStandIn('backup', delay=SLOW_MIRROR_DELAY_SECONDS)
+        download_failover_passed = _run_scenario(
+            'download failover',
+            os.path.join(scratch_directory, 'download-failover'),
+            arguments_context,
+            [backup, broken],
+            [
+                r'Selected {}: the fastest of 2 healthy mirror\(s\)'.format(_url(broken)),
+                r'Installation from {} failed with exit code \d+\. Failing over to {}\.'.format(
+                    _url(broken),
+                    _url(backup)
+                ),
+                r'Installed from {}\.'.format(_url(backup)),
+            ],
+            [broken, backup]
+        )
+    finally:
+        shutil.rmtree(scratch_directory, ignore_errors=True)
+
+    if not (probing_passed and failover_passed and download_failover_passed):
+        exit(1)
@@ -0,0 +1,271 @@
+"""
+This script compares the installation and `eb` startup times of the EBCLI
+installed in a virtualenv against those of the EBCLI built as a zipapp by
+`ebcli_installer.py`. It also checks that `ebcli_installer.py` reaches its
+first step within a latency budget, and exits with a non-0 return code if
+it doesn't.
+
+Prerequisites:
+
+    Those of `ebcli_installer.py`; the zipapp layout requires Python 3.5 or
+    later.
+
+Usage:
+
+    To execute script:
+
+        python scripts/installer_benchmark.py --version 3.14.13
+
+        # specify Python executable and number of timed `eb` invocations
+        python scripts/installer_benchmark.py -p /usr/bin/python3 -n 10
+
+        # only check the startup latency of `ebcli_installer.py`
+        python scripts/installer_benchmark.py --startup-only
+
+    To view help text:
+
+        python scripts/installer_benchmark.py --help
+
+"""
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SCRIPTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+INSTALLER = os.path.join(SCRIPTS_DIRECTORY, 'ebcli_installer.py')
+
+
+STARTUP_LATENCY_BUDGET_SECONDS = 0.5
+
+
+def _install(location, arguments, layout_arguments):
+    """
+    Function installs the EBCLI at `location` using `ebcli_installer.py`
+    and returns the time taken.
+
+    :param location: the location to install the EBCLI in
+    :param arguments: the parsed command-line arguments of this script
+    :param layout_arguments: additional arguments of `ebcli_installer.py`
+                             selecting the layout of the installation
+    :return: the number of seconds installation took
+    """
+    installer_args = [
+        sys.executable, INSTALLER,
+        '--quiet',
+        '--hide-export-recommendation',
+        '--location', location,
+    ] + layout_arguments
+    if arguments.version:
+        installer_args += ['--version', arguments.version]
+    if arguments.python_installation:
+        installer_args += ['--python-installation', arguments.python_installation]
+    if arguments.virtualenv_executable:
+        installer_args += ['--virtualenv-executable', arguments.virtualenv_executable]
+
+    return _time(installer_args)
+
+
+def _parse_arguments():
+    """
+    Function creates an `ArgumentParser`, parses arguments, and returns
+    the parsed arguments.
+
+    :return: an instance of argparse.Namespace representing the command-line
+             arguments passed by the user.
+    """
+    parser = argparse.ArgumentParser(
+        description='Compares installation and startup times of the virtualenv and '
+                    'zipapp layouts of the EBCLI.'
+    )
+    parser.add_argument(
+        '-e', '--virtualenv-executable',
+        help="path to the virtualenv installation to use to create the EBCLI's virtualenv"
+    )
+    parser.add_argument(
+        '-n', '--invocations',
+        type=int,
+        default=5,
+        help='number of timed `eb --version` invocations per layout'
+    )
+    parser.add_argument(
+        '-m', '--max-startup-latency',
+        type=float,
+        default=STARTUP_LATENCY_BUDGET_SECONDS,
+        help='number of seconds `ebcli_installer.py` may take to reach its first step; '
+             'defaults to {}'.format(STARTUP_LATENCY_BUDGET_SECONDS)
+    )
+    parser.add_argument(
+        '-p', '--python-installation',
+        help='path to the python installation under which to install the awsebcli'
+    )
+    parser.add_argument(
+        '-s', '--startup-only',
+        action='store_true',
+        help='only check the startup latency of `ebcli_installer.py`'
+    )
+    parser.add_argument(
+        '-v', '--version',
+        help='version of EBCLI to install'
+    )
+
+    return parser.parse_args()
+
+
+def _print_results(results):
+    """
+    Function prints `results` as a table.
+
+    :param results: a list of (measurement, virtualenv seconds, zipapp seconds)
+                    tuples; seconds may be None where not applicable
+    :return: None
+    """
+    print('{0:<40} {1:>12} {2:>12}'.format('', 'virtualenv', 'zipapp'))
+    for measurement, virtualenv_seconds, zipapp_seconds in results:
+        print(
+            '{0:<40} {1:>12} {2:>12}'.format(
+                measurement,
+                '-' if virtualenv_seconds is None else '{:.3f}s'.format(virtualenv_seconds),
+                '-' if zipapp_seconds is None else '{:.3f}s'.format(zipapp_seconds),
+            )
+        )
+
+
+def _time(args, environment=None):
+    """
+    Function executes `args`, discarding their output, and returns the
+    time taken.
+
+    :param args: the args to pass to `subprocess.Popen`
+    :param environment: the environment variables to execute `args` with
+    :return: the number of seconds `args` took to execute
+    :side-effect: script will exit with a non-0 return code if `args` fail
+    """
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        returncode = subprocess.call(args, stdout=devnull, stderr=devnull, env=environment)
+        elapsed = time.time() - start
+
+    if returncode != 0:
+        print('ERROR: "{}" failed with exit code {}'.format(' '.join(args), returncode))
+        exit(returncode)
+
+    return elapsed
+
+
+def _time_to_first_step(location, invocations, environment):
+    """
+    Function executes `ebcli_installer.py` `invocations` times and returns the
+    median time it took to print the title of its first step, which covers
+    starting the interpreter, importing the installer, and parsing arguments.
+    The installer is asked to take inventory of the artifacts at `location`,
+    whose first step does not depend on the network or on installed software.
+
+    :param location: the location the installer is pointed at
+    :param invocations: the number of times to execute the installer
+    :param environment: the environment variables to execute the installer with
+    :return: the median number of seconds the installer took to reach its
+             first step
+    """
+    durations = []
+    for _ in range(invocations):
+        start = time.time()
+        process = subprocess.Popen(
+            [sys.executable, INSTALLER, '--gc', '--dry-run', '--location', location],
+            stdout=subprocess.PIPE,
+            env=dict(environment, PYTHONUNBUFFERED='1')
+        )
+        for line in iter(process.stdout.readline, b''):
+            if re.match(br'^1\. ', line):
+                durations.append(time.time() - start)
+                break
+        else:
+            process.communicate()
+            print('ERROR: `ebcli_installer.py` did not reach its first step')
+            exit(1)
+        process.communicate()
+
+    return sorted(durations)[len(durations) // 2]
+
+
+def _time_invocations(eb_wrapper, invocations, environment):
+    """
+    Function invokes `eb --version` through `eb_wrapper` `invocations` times
+    and returns the median time taken.
+
+    :param eb_wrapper: the path to the `eb` wrapper to invoke
+    :param invocations: the number of times to invoke `eb_wrapper`
+    :param environment: the environment variables to invoke `eb_wrapper` with
+    :return: the median number of seconds an invocation took
+    """
+    durations = sorted(
+        _time([eb_wrapper, '--version'], environment)
+        for _ in range(invocations)
+    )
+
+    return durations[len(durations) // 2]
+
+
+if __name__ == '__main__':
+    arguments_context = _parse_arguments()
+    scratch_directory = tempfile.mkdtemp()
+    try:
+        environment = dict(os.environ, EBCLI_DISABLE_UPDATE_CHECK='1')
+        environment.pop('VIRTUAL_ENV', None)
+
+        startup_latency = _time_to_first_step(
+            scratch_directory,
+            arguments_context.invocations,
+            environment
+        )
+        print(
+            'median time of `ebcli_installer.py` to its first step: {:.3f}s '
+            '(budget: {:.3f}s)'.format(startup_latency, arguments_context.max_startup_latency)
+        )
+        if startup_latency > arguments_context.max_startup_latency:
+            print('ERROR: `ebcli_installer.py` exceeded its startup latency budget')
+            exit(1)
+        if arguments_context.startup_only:
+            exit(0)
+
+        virtualenv_location = os.path.join(scratch_directory, 'virtualenv')
+        zipapp_location = os.path.join(scratch_directory, 'zipapp')
+        virtualenv_install = _install(virtualenv_location, arguments_context, [])
+        zipapp_build = _install(zipapp_location, arguments_context, ['--zipapp'])
+
+        versions_directory = os.path.join(zipapp_location, '.ebcli-virtual-env', 'versions')
+        zipapp = [
+            os.path.join(versions_directory, entry)
+            for entry in os.listdir(versions_directory)
+            if entry.endswith('.pyz')
+        ][0]
+        copy_start = time.time()
+        shutil.copy(zipapp, os.path.join(scratch_directory, 'eb.pyz'))
+        zipapp_copy = time.time() - copy_start
+
+        virtualenv_eb = os.path.join(virtualenv_location, '.ebcli-virtual-env', 'executables', 'eb')
+        zipapp_eb = os.path.join(zipapp_location, '.ebcli-virtual-env', 'executables', 'eb')
+        environment['EBCLI_ZIPAPP_CACHE'] = os.path.join(scratch_directory, 'zipapp-cache')
+        zipapp_first_invocation = _time([zipapp_eb, '--version'], environment)
+
+        _print_results(
+            [
+                ('installation (build, for zipapp)', virtualenv_install, zipapp_build),
+                ('installation by copying the zipapp', None, zipapp_copy),
+                ('first `eb --version` (extraction)', None, zipapp_first_invocation),
+                (
+                    'median `eb --version` of {}'.format(arguments_context.invocations),
+                    _time_invocations(virtualenv_eb, arguments_context.invocations, environment),
+                    _time_invocations(zipapp_eb, arguments_context.invocations, environment),
+                ),
+            ]
+        )
+    finally:
+        shutil.rmtree(scratch_directory, ignore_errors=True)
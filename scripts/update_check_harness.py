@@ -0,0 +1,324 @@
+"""
+This script checks the update check of the `eb` wrapper generated by
+`ebcli_installer.py` against local stand-ins for package indexes, which
+serve canned awsebcli project pages. It creates a stand-in installation of
+the EBCLI whose `eb` only echoes its arguments, next to the real wrapper,
+and exits with a non-0 return code if the wrapper doesn't:
+
+    1. refresh the update check cache in the background from the index
+       recorded at installation time, ignoring `PIP_INDEX_URL`, and record
+       the highest final release listed
+    2. print the notice of the newer version, from the cache alone
+    3. check the index in `EBCLI_UPDATE_CHECK_INDEX_URL` instead, when set
+    4. record a failure to reach the index without printing a notice
+    5. fall back to the default TTL when `EBCLI_UPDATE_CHECK_TTL` is invalid
+    6. neither print a notice nor refresh the cache when
+       `EBCLI_DISABLE_UPDATE_CHECK` is set
+
+Prerequisites:
+
+    Python 3 on Linux or macOS; the network is not used.
+
+Usage:
+
+    To execute script:
+
+        python scripts/update_check_harness.py
+
+    To view help text:
+
+        python scripts/update_check_harness.py --help
+
+"""
+import argparse
+import os
+import re
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import ebcli_installer
+
+
+INSTALLED_VERSION = '3.14.13'
+
+
+RECORDED_INDEX_PAGE = '\n'.join(
+    [
+        '<html><body>',
+        '<a href="#">awsebcli-3.14.13.tar.gz</a><br/>',
+        '<a href="#">awsebcli-3.99.0.tar.gz</a><br/>',
+        '<a href="#">awsebcli-3.100.1-py3-none-any.whl</a><br/>',
+        '<a href="#">awsebcli-4.0.0rc1.tar.gz</a><br/>',
+        '</body></html>',
+    ]
+)
+
+
+OVERRIDE_INDEX_PAGE = '<html><body><a href="#">awsebcli-3.200.0.tar.gz</a></body></html>'
+
+
+class CannedIndex(object):
+    """
+    Class serves `page` as the simple (PEP 503) project page of the awsebcli
+    of a package index on a local port, and counts the requests for it.
+    """
+    def __init__(self, page):
+        self.page = page
+        self.requests = 0
+        self._server = HTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.url = 'http://127.0.0.1:{}/simple'.format(self._server.server_address[1])
+
+    def start(self):
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        index = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0].rstrip('/') != '/simple/awsebcli':
+                    self.send_error(404)
+                    return
+                index.requests += 1
+                body = index.page.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _create_installation(location, index_url):
+    """
+    Function creates, at `location`, a stand-in installation of
+    `INSTALLED_VERSION` of the EBCLI whose `eb` echoes its arguments, and the
+    `eb` wrapper `ebcli_installer.py` would generate for it after installing
+    from `index_url`.
+
+    :param location: the location to create the installation in
+    :param index_url: the URL of the package index the EBCLI was installed from
+    :return: the path to the `eb` wrapper
+    """
+    root = os.path.join(location, ebcli_installer.VIRTUALENV_DIR_NAME)
+    environment_directory = os.path.join(root, ebcli_installer.ENVIRONMENTS_DIR_NAME, INSTALLED_VERSION)
+    bin_location = os.path.join(environment_directory, 'bin')
+    os.makedirs(bin_location)
+    os.makedirs(
+        os.path.join(
+            environment_directory, 'lib', 'python3', 'site-packages',
+            'awsebcli-{}.dist-info'.format(INSTALLED_VERSION)
+        )
+    )
+    open(os.path.join(bin_location, 'activate_this.py'), 'w').close()
+    _write_executable(os.path.join(bin_location, 'eb'), '#!/bin/sh\necho "eb $*"\n')
+    with open(os.path.join(root, ebcli_installer.DEFAULT_ENVIRONMENT_POINTER), 'w') as file:
+        file.write(INSTALLED_VERSION + '\n')
+
+    wrapper = os.path.join(ebcli_installer._eb_wrapper_location(location), 'eb')
+    os.makedirs(os.path.dirname(wrapper))
+    _write_executable(wrapper, ebcli_installer._python_script_body(location, None, index_url))
+
+    return wrapper
+
+
+def _invoke(wrapper, **environment_variables):
+    """
+    Function invokes `eb --version` through `wrapper` and returns its output.
+
+    :param wrapper: the path to the `eb` wrapper
+    :param environment_variables: environment variables to invoke `wrapper`
+                                  with in addition to those of this script
+    :return: a tuple of the return code, the STDOUT, and the STDERR of `eb`
+    """
+    process = subprocess.Popen(
+        [wrapper, '--version'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=dict(ENVIRONMENT, **environment_variables)
+    )
+    stdout, stderr = process.communicate()
+
+    return process.returncode, stdout.decode('utf-8'), stderr.decode('utf-8')
+
+
+def _parse_arguments():
+    """
+    Function creates an `ArgumentParser`, parses arguments, and returns
+    the parsed arguments.
+
+    :return: an instance of argparse.Namespace representing the command-line
+             arguments passed by the user.
+    """
+    parser = argparse.ArgumentParser(
+        description='Checks the update check of the `eb` wrapper against local stand-ins '
+                    'for package indexes.'
+    )
+    parser.add_argument(
+        '-t', '--timeout',
+        type=float,
+        default=10,
+        help='number of seconds to wait for the background refresh of the update check cache'
+    )
+
+    return parser.parse_args()
+
+
+def _read_cache(cache):
+    try:
+        with open(cache) as file:
+            return file.read()
+    except IOError:
+        return None
+
+
+def _wait_for_refresh(cache, timeout):
+    """
+    Function waits for the background process spawned by the `eb` wrapper to
+    write the update check cache and release its lock.
+
+    :param cache: the path to the update check cache
+    :param timeout: the number of seconds to wait for
+    :return: the contents of the cache, or None if it wasn't written in time
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if os.path.exists(cache) and not os.path.exists(cache + '.lock'):
+            return _read_cache(cache)
+        time.sleep(0.1)
+
+
+def _write_executable(path, contents):
+    with open(path, 'w') as file:
+        file.write(contents)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def _unused_index_url():
+    probe = socket.socket()
+    probe.bind(('127.0.0.1', 0))
+    url = 'http://127.0.0.1:{}/simple'.format(probe.getsockname()[1])
+    probe.close()
+
+    return url
+
+
+ENVIRONMENT = dict(
+    (name, value) for name, value in os.environ.items()
+    if not name.startswith('EBCLI_') and name != 'VIRTUAL_ENV'
+)
+# The index set at invocation time must not be checked
+ENVIRONMENT['PIP_INDEX_URL'] = _unused_index_url()
+
+
+if __name__ == '__main__':
+    arguments_context = _parse_arguments()
+    timeout = arguments_context.timeout
+    recorded_index = CannedIndex(RECORDED_INDEX_PAGE)
+    override_index = CannedIndex(OVERRIDE_INDEX_PAGE)
+    recorded_index.start()
+    override_index.start()
+    scratch_directory = tempfile.mkdtemp()
+    failures = []
+    try:
+        wrapper = _create_installation(scratch_directory, recorded_index.url)
+        cache = os.path.join(
+            scratch_directory,
+            ebcli_installer.VIRTUALENV_DIR_NAME,
+            ebcli_installer.UPDATE_CHECK_CACHE
+        )
+        notice = 'Note: EBCLI {} is available; you are using {}.'
+
+        def check(title, passed, details=''):
+            print('{0:<60} {1}'.format(title, 'passed' if passed else 'FAILED'))
+            if not passed:
+                failures.append(title)
+                if details:
+                    print('    {}'.format(details))
+
+        returncode, stdout, stderr = _invoke(wrapper)
+        check(
+            '`eb` is invoked',
+            returncode == 0 and stdout.strip() == 'eb --version',
+            'exit code {}, STDOUT {!r}, STDERR {!r}'.format(returncode, stdout, stderr)
+        )
+        check('no notice without a cache', 'Note:' not in stderr, repr(stderr))
+        contents = _wait_for_refresh(cache, timeout)
+        check(
+            'cache refreshed from the index recorded at installation',
+            contents is not None and re.match(r'^\d+ 3\.100\.1\n$', contents)
+            and recorded_index.requests == 1,
+            'cache {!r}, {} request(s)'.format(contents, recorded_index.requests)
+        )
+
+        _, _, stderr = _invoke(wrapper)
+        time.sleep(1)
+        check(
+            'notice printed from a fresh cache, without a refresh',
+            notice.format('3.100.1', INSTALLED_VERSION) in stderr and recorded_index.requests == 1,
+            'STDERR {!r}, {} request(s)'.format(stderr, recorded_index.requests)
+        )
+
+        os.remove(cache)
+        _invoke(wrapper, EBCLI_UPDATE_CHECK_INDEX_URL=override_index.url)
+        contents = _wait_for_refresh(cache, timeout)
+        check(
+            'cache refreshed from EBCLI_UPDATE_CHECK_INDEX_URL',
+            contents is not None and re.match(r'^\d+ 3\.200\.0\n$', contents)
+            and override_index.requests == 1,
+            'cache {!r}, {} request(s)'.format(contents, override_index.requests)
+        )
+
+        os.remove(cache)
+        _invoke(wrapper, EBCLI_UPDATE_CHECK_INDEX_URL=_unused_index_url())
+        contents = _wait_for_refresh(cache, timeout)
+        _, _, stderr = _invoke(wrapper)
+        check(
+            'failure to reach the index recorded without a notice',
+            contents is not None and re.match(r'^\d+ \n$', contents) and 'Note:' not in stderr,
+            'cache {!r}, STDERR {!r}'.format(contents, stderr)
+        )
+
+        with open(cache, 'w') as file:
+            file.write('{} 9.9.9\n'.format(int(time.time())))
+        returncode, _, stderr = _invoke(wrapper, EBCLI_UPDATE_CHECK_TTL='abc')
+        check(
+            'invalid EBCLI_UPDATE_CHECK_TTL falls back to the default TTL',
+            returncode == 0 and notice.format('9.9.9', INSTALLED_VERSION) in stderr,
+            'exit code {}, STDERR {!r}'.format(returncode, stderr)
+        )
+
+        with open(cache, 'w') as file:
+            file.write('0 9.9.9\n')
+        _, _, stderr = _invoke(wrapper, EBCLI_DISABLE_UPDATE_CHECK='1')
+        time.sleep(1)
+        check(
+            'EBCLI_DISABLE_UPDATE_CHECK turns the check off',
+            'Note:' not in stderr and _read_cache(cache) == '0 9.9.9\n',
+            'STDERR {!r}, cache {!r}'.format(stderr, _read_cache(cache))
+        )
+    finally:
+        recorded_index.stop()
+        override_index.stop()
+        shutil.rmtree(scratch_directory, ignore_errors=True)
+
+    if failures:
+        exit(1)